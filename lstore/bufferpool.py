@@ -1,4 +1,7 @@
 import os
+import time
+import threading
+from contextlib import contextmanager
 from lstore.config import POOL_SIZE
 from collections import OrderedDict
 from lstore.page import Page
@@ -12,6 +15,8 @@ class BufferPool:
         self.pool_size = POOL_SIZE          # number of frames in the buffer pool
         self.io_count = 0                   # io operation counter (optimization metric)
         self.frames = OrderedDict()         # {page_path: Frame}; Use OrderedDict to implement LRU - most recently used items are at the end
+        self.last_unpinned_ns = {}          # {page_path: monotonic_ns of last unpin} for age-based eviction
+        self._sweep_lock = threading.Lock() # serializes evict_stale sweeps across worker threads
         
 
     def __repr__(self):
@@ -24,8 +29,7 @@ class BufferPool:
         Move accessed page to end of LRU order
         """
         if page_path in self.frames:
-            frame = self.frames.pop(page_path)      # remove from path from current location in dict
-            self.frames[page_path] = frame          # add it back to the end of the dict (most recently used)
+            self.frames.move_to_end(page_path)      # single C-level probe instead of pop + reinsert
         
 
     def evict_page(self):
@@ -46,6 +50,7 @@ class BufferPool:
             if frame.pin_count == 0:
                 if not frame.dirty_bit:
                     del self.frames[page_path] # Found clean unpinned page - delete immediately
+                    self.last_unpinned_ns.pop(page_path, None)
                     return True
                 elif first_dirty_page_path is None:
                     # Keep track of first dirty unpinned page path
@@ -56,6 +61,7 @@ class BufferPool:
             dirty_frame = self.frames[first_dirty_page_path]
             self.write_to_disk(first_dirty_page_path, dirty_frame.page)
             del self.frames[first_dirty_page_path]
+            self.last_unpinned_ns.pop(first_dirty_page_path, None)
             return True
                 
         # If we get here, all pages are pinned
@@ -108,6 +114,7 @@ class BufferPool:
         """
         if page_path in self.frames:            
             del self.frames[page_path]
+            self.last_unpinned_ns.pop(page_path, None)
             return True
         return False
 
@@ -167,8 +174,10 @@ class BufferPool:
         frame = self.frames.get(page_path)
         if frame:
             frame.increment_pin_count()
-            self._update_lru(page_path)
-        
+            # Inline the LRU touch - frame is known present, so skip
+            # _update_lru's membership re-probe
+            self.frames.move_to_end(page_path)
+
             return frame.page
 
         # Not in buffer pool, try to add it
@@ -180,20 +189,77 @@ class BufferPool:
         return None
 
 
+    @contextmanager
+    def pinned(self, page_path):
+        """
+        Pin a page for the duration of a with-block
+        Unpins on every exit path, including exceptions
+        """
+        page = self.get_page(page_path)
+        try:
+            yield page
+        finally:
+            self.unpin_page(page_path)
+
+
     def unpin_page(self, page_path):
         """
         Decrement pin count for a page
         """
-        if page_path in self.frames:
-            self.frames[page_path].decrement_pin_count()
+        frame = self.frames.get(page_path)
+        if frame is not None:
+            frame.decrement_pin_count()
+            self.last_unpinned_ns[page_path] = time.monotonic_ns()
+
+
+    def evict_stale(self, max_age_ns):
+        """
+        Evict unpinned frames that have not been touched for max_age_ns,
+        flushing dirty ones. Keeps the resident set small during long write
+        runs without waiting for the pool-size cap.
+        """
+        # Sweeps run on whichever writer thread trips the interval, so
+        # serialize them; a thread that loses the race just skips its turn
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic_ns()
+            stamps = self.last_unpinned_ns
+            for page_path, frame in list(self.frames.items()):
+                if frame.pin_count != 0:
+                    continue
+                last = stamps.get(page_path)
+                if last is None or now - last <= max_age_ns:
+                    continue
+                if frame.dirty_bit:
+                    # Clear the bit before flushing: a writer that lands
+                    # during the disk write (fsync drops the GIL) sets it
+                    # again, and the re-check below keeps the frame
+                    # resident so its newer data is flushed later
+                    frame.clear_dirty_bit()
+                    if not self.write_to_disk(page_path, frame.page):
+                        frame.set_dirty_bit()
+                        continue
+                # Re-check right before dropping the frame: another thread
+                # may have pinned or re-dirtied it since the scan (or
+                # during the flush above), and evicting it then would lose
+                # that thread's write
+                if (frame.pin_count != 0 or frame.dirty_bit or
+                        self.frames.get(page_path) is not frame):
+                    continue
+                del self.frames[page_path]
+                stamps.pop(page_path, None)
+        finally:
+            self._sweep_lock.release()
 
 
     def mark_dirty(self, page_path):
         """
         Mark a page as dirty
         """
-        if page_path in self.frames:
-            self.frames[page_path].set_dirty_bit()
+        frame = self.frames.get(page_path)
+        if frame is not None:
+            frame.set_dirty_bit()
             
 
     def rename_frame(self, old_path, new_path):
@@ -213,9 +279,13 @@ class BufferPool:
         # Add the frame under the new key
         self.frames[new_path] = frame
         
-        # Now remove the old key (only after new one is added)
+        # Now remove the old key (only after new one is added), carrying
+        # the unpin stamp along so the old path's entry cannot pile up
         del self.frames[old_path]
-    
+        stamp = self.last_unpinned_ns.pop(old_path, None)
+        if stamp is not None:
+            self.last_unpinned_ns[new_path] = stamp
+
         return True
 
 
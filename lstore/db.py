@@ -1,6 +1,7 @@
 import os
 import pickle
-from lstore.table import Table
+from collections import OrderedDict
+from lstore.table import Table, rid_from_str
 
 class Database:
     def __init__(self):
@@ -26,9 +27,13 @@ class Database:
 
     def close(self):
         """Close database and save all tables metadata and indices"""
-        # Wait for any ongoing merge operations to complete
+        # Stop each table's merge poller first - otherwise a poller tick
+        # could dispatch a fresh merge after the join below, mutating the
+        # bufferpool while the save loop iterates its frames - then wait
+        # for any ongoing merge operations to complete
         for name, table in self.tables.items():
-            if hasattr(table, 'merge_thread') and table.merge_thread and table.merge_thread.is_alive():
+            table.stop_merge_poller()
+            if table.merge_thread and table.merge_thread.is_alive():
                 try:
                     table.merge_thread.join(timeout=30)
                     if table.merge_thread.is_alive():
@@ -65,12 +70,18 @@ class Database:
             with open(meta_path, 'wb') as f:
                 pickle.dump(metadata, f)
                 
+            # Flush any cached index entries into the column trees first,
+            # otherwise unflushed non-PK updates would be dropped by the save
+            table.index.flush_cache()
+
             # Save index data separately (without locks)
             index_path = os.path.join(self.db_path, "_tables", f"{name}_index.pickle")
             index_data = {
                 'primary_key_cache': table.index.primary_key_cache,
                 'indices': table.index.indices,
-                'sorted_records': table.index.sorted_records
+                'pk_keys': table.index.pk_keys,
+                'pk_rids': table.index.pk_rids,
+                'rid_indirection': table.index.rid_indirection
             }
             with open(index_path, 'wb') as f:
                 pickle.dump(index_data, f)
@@ -123,8 +134,14 @@ class Database:
                 # Create fresh table instance
                 table = Table(name, metadata['num_columns'], metadata['key'], self.db_path)
                 
-                # Apply metadata to reconstruct table state
-                table.page_directory = metadata['page_directory']
+                # Apply metadata to reconstruct table state. Databases saved
+                # before RIDs became ints keyed the directory on "b12"/"t34"
+                # strings - translate them and rebuild the index from pages.
+                page_directory = metadata['page_directory']
+                legacy_rids = bool(page_directory) and isinstance(next(iter(page_directory)), str)
+                if legacy_rids:
+                    page_directory = {rid_from_str(r): loc for r, loc in page_directory.items()}
+                table.page_directory = page_directory
                 table.current_base_rid = metadata['current_base_rid']
                 table.current_tail_rid = metadata['current_tail_rid']
                 table.tail_page_locations = metadata['tail_page_locations']
@@ -137,13 +154,22 @@ class Database:
                 
                 # Load index data separately
                 index_path = os.path.join(self.db_path, "_tables", f"{name}_index.pickle")
-                if os.path.exists(index_path):
+                if legacy_rids:
+                    # The pickled index still holds string RIDs throughout;
+                    # rebuilding from the (translated) pages is simpler than
+                    # rewriting every cached structure
+                    table.index.refresh_indexes(table)
+                elif os.path.exists(index_path):
                     with open(index_path, 'rb') as f:
                         index_data = pickle.load(f)
                         # Apply index data to the newly created index
-                        table.index.primary_key_cache = index_data.get('primary_key_cache', {})
+                        table.index.primary_key_cache = OrderedDict(index_data.get('primary_key_cache', {}))
                         table.index.indices = index_data.get('indices', {})
-                        table.index.sorted_records = index_data.get('sorted_records', [])
+                        table.index.pk_keys = index_data.get('pk_keys', [])
+                        table.index.pk_rids = index_data.get('pk_rids', [])
+                        table.index.rid_indirection = index_data.get('rid_indirection', {})
+                        table.index._pk_sorted = False
+                        table.index._pk_keys_arr = None
                 
                 # Add to tables dictionary
                 self.tables[name] = table
@@ -1,20 +1,67 @@
 import bisect
-from collections import deque
+import heapq
+import os
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from operator import itemgetter
+import numpy as np
+
+# Prefer the C-speed sorted container when available; the from-scratch
+# BPlusTree below is kept as a fallback so the package still works without it.
+try:
+    from sortedcontainers import SortedDict
+except ImportError:
+    SortedDict = None
+
+# A compiled build of the fallback tree (e.g. cythonized as lstore._bplustree,
+# same API as BPlusTree below) is picked up automatically when present.
+try:
+    from lstore._bplustree import BPlusTree as CompiledBPlusTree
+except ImportError:
+    CompiledBPlusTree = None
 
 class Index:
     def __init__(self, table):
         self.table_name = table.name
         self.num_columns = table.num_columns
         self.indices = [None] * self.num_columns
-        # Use deque for faster append/pop operations
-        self.insert_cache = {col: deque() for col in range(self.num_columns)}
+        # Per-column caches as parallel key/rid lists (SoA) - no per-pair tuple
+        self.insert_keys = [[] for _ in range(self.num_columns)]
+        self.insert_rids = [[] for _ in range(self.num_columns)]
         self.max_keys = [None] * self.num_columns
         self.insert_cache_size = 50000
         # Increase threshold to reduce sorting frequency
-        self.unsorted_cache = {col: deque() for col in range(self.num_columns)} 
+        self.unsorted_keys = [[] for _ in range(self.num_columns)]
+        self.unsorted_rids = [[] for _ in range(self.num_columns)]
         self.unsorted_threshold = 2000
-        self.primary_key_cache = {}
-        self.sorted_records = []
+        # Key sets mirroring the caches for O(1) membership in exists
+        self.insert_set = [set() for _ in range(self.num_columns)]
+        self.unsorted_set = [set() for _ in range(self.num_columns)]
+        # Tracks whether each unsorted cache happens to be in key order, so
+        # flush can skip the sort for already-sorted producers
+        self.unsorted_is_sorted = [True] * self.num_columns
+        # Columns with cached entries that still need flushing to their tree
+        self._dirty_cols = set()
+        # Sorted mirrors of each column's tree for vectorized range scans,
+        # rebuilt lazily after a flush invalidates them
+        self._col_keys = [None] * self.num_columns
+        self._col_rids = [None] * self.num_columns
+        self._col_keys_arr = [None] * self.num_columns
+        # Bounded LRU of hot primary keys - the tree remains the full index,
+        # so evicted keys just fall through to it on lookup
+        self.primary_key_cache = OrderedDict()
+        self.primary_key_cache_size = 100000
+        # Current indirection per base RID, kept in sync by insert/update so
+        # readers can jump straight to the tail record without touching the
+        # base page
+        self.rid_indirection = {}
+        # Primary key entries as parallel lists (SoA); kept unsorted until a
+        # range query needs them, then sorted once via numpy argsort
+        self.pk_keys = []
+        self.pk_rids = []
+        self._pk_sorted = True
+        self._pk_keys_arr = None    # cached numpy mirror of pk_keys
         for col in range(self.num_columns):
             self.create_index(col)
 
@@ -25,7 +72,13 @@ class Index:
     def create_index(self, column_number):
         if column_number < 0 or column_number >= self.num_columns:
             return False
-        self.indices[column_number] = BPlusTree()
+        if SortedDict is not None:
+            self.indices[column_number] = SortedContainerTree()
+        elif CompiledBPlusTree is not None:
+            self.indices[column_number] = CompiledBPlusTree(int_keys=True)
+        else:
+            # All columns are integers, so pack node keys into int64 arrays
+            self.indices[column_number] = BPlusTree(int_keys=True)
 
 
     def refresh_indexes(self, table):
@@ -34,28 +87,60 @@ class Index:
         """
         # Clear existing indexes
         self.indices = [None] * self.num_columns
-        self.primary_key_cache = {}
-        self.sorted_records = []
+        self.primary_key_cache = OrderedDict()
+        self.rid_indirection = {}
+        self.pk_keys = []
+        self.pk_rids = []
+        self._pk_sorted = True
+        self._pk_keys_arr = None
+
+        self._col_keys = [None] * self.num_columns
+        self._col_rids = [None] * self.num_columns
+        self._col_keys_arr = [None] * self.num_columns
 
         # Recreate indexes
         for col in range(self.num_columns):
             self.create_index(col)
 
-        # Re-index all records in the table
-        for _, locations in table.page_directory.items():
-            base_path, base_offset = locations[0]
-            print("base path: " + base_path)
-            base_record = table.bufferpool.get_page(base_path).read_index(base_offset)
-            table.bufferpool.unpin_page(base_path)
-            self.add_record(base_record)
+        # Re-index all base records in the table; tail records are reached
+        # through the base record's indirection, and feeding them to
+        # add_record would overwrite the primary-key caches with tail RIDs.
+        # Consecutive directory entries usually share a base page, so keep
+        # the current page pinned and only swap when the path changes
+        # instead of a get/unpin per record.
+        from lstore.table import rid_is_tail  # deferred: table imports this module
+
+        bufferpool = table.bufferpool
+        prev_path = None
+        page = None
+        for rid, locations in table.page_directory.items():
+            if rid_is_tail(rid):
+                continue
+            base_path, base_offset = locations
+            if base_path != prev_path:
+                if prev_path is not None:
+                    bufferpool.unpin_page(prev_path)
+                page = bufferpool.get_page(base_path)
+                prev_path = base_path
+            self.add_record(page.read_index(base_offset))
+        if prev_path is not None:
+            bufferpool.unpin_page(prev_path)
 
 
     """
-    Flush the cache to the index
+    Flush the cached entries to the index (only columns that are dirty)
     """
     def flush_cache(self):
-        for col in range(self.num_columns):
-            self._flush_cache_for_column(col)
+        dirty = list(self._dirty_cols)
+        if not dirty:
+            return
+        if len(dirty) == 1:
+            self._flush_cache_for_column(dirty[0])
+            return
+        # Each column's caches and tree are disjoint, so the per-column
+        # flushes can run concurrently on the pool
+        with ThreadPoolExecutor(max_workers=min(len(dirty), os.cpu_count() or 1)) as ex:
+            list(ex.map(self._flush_cache_for_column, dirty))
 
 
     """
@@ -63,102 +148,170 @@ class Index:
     """
     def add_record(self, record):
         rid_to_add = record.rid
-        encoded_rid = rid_to_add.encode('utf-8')
+        # Base records carry their own indirection; seed the cache so the
+        # first read needn't fetch the base page
+        if rid_to_add == record.base_rid:
+            self.rid_indirection[rid_to_add] = record.indirection
         # For primary key (column 0), update primary key cache and sorted list
         primary_key = record.columns[0]
         if primary_key is not None:
-            self.primary_key_cache[primary_key] = encoded_rid
-            # Insert into sorted_records using bisect for O(log n) insertion
-            bisect.insort(self.sorted_records, (primary_key, encoded_rid))
+            self.primary_key_cache[primary_key] = rid_to_add
+            if len(self.primary_key_cache) > self.primary_key_cache_size:
+                self.primary_key_cache.popitem(last=False)
+            # Defer sorting: append now, argsort once when a range query needs it
+            if self._pk_sorted and self.pk_keys and primary_key < self.pk_keys[-1]:
+                self._pk_sorted = False
+            self.pk_keys.append(primary_key)
+            self.pk_rids.append(rid_to_add)
+            self._pk_keys_arr = None
 
         for col, key in enumerate(record.columns):
             if key is None:
                 continue
             # Instead of sorting per insert, simply append to unsorted cache
-            self.unsorted_cache[col].append((key, encoded_rid))
+            unsorted_keys = self.unsorted_keys[col]
+            if self.unsorted_is_sorted[col] and unsorted_keys and key < unsorted_keys[-1]:
+                self.unsorted_is_sorted[col] = False
+            unsorted_keys.append(key)
+            self.unsorted_rids[col].append(rid_to_add)
+            self.unsorted_set[col].add(key)
+            self._dirty_cols.add(col)
             # Remove per-insert threshold check: we now defer sorting to flush_cache
-            if len(self.insert_cache[col]) >= self.insert_cache_size:
+            if len(self.insert_keys[col]) >= self.insert_cache_size:
                 self._flush_cache_for_column(col)
 
 
+    """
+    Sort the primary key SoA arrays lazily and return the cached numpy key array
+    """
+    def _sorted_pk_array(self):
+        if not self._pk_sorted:
+            # One argsort replaces N shifting insorts on the bulk-load path
+            order = np.argsort(np.asarray(self.pk_keys))
+            self.pk_keys = [self.pk_keys[i] for i in order]
+            self.pk_rids = [self.pk_rids[i] for i in order]
+            self._pk_sorted = True
+            self._pk_keys_arr = None
+        if self._pk_keys_arr is None:
+            self._pk_keys_arr = np.asarray(self.pk_keys)
+        return self._pk_keys_arr
+
+
     """
     Efficiently merge two sorted lists
     """
-    def _merge_sorted_lists(self, list1, list2):
-        result = []
-        i, j = 0, 0
-        len1, len2 = len(list1), len(list2)
-        
-        # Merge in O(n+m) time
-        while i < len1 and j < len2:
-            if list1[i][0] <= list2[j][0]:
-                result.append(list1[i])
-                i += 1
-            else:
-                result.append(list2[j])
-                j += 1
-                
-        # Add remaining elements
-        result.extend(list1[i:])
-        result.extend(list2[j:])
-        return result
+    def _merge_sorted_lists(self, keys1, rids1, keys2, rids2):
+        # heapq.merge runs the O(n+m) two-pointer merge in C
+        out_keys, out_rids = [], []
+        append_key, append_rid = out_keys.append, out_rids.append
+        for k, r in heapq.merge(zip(keys1, rids1), zip(keys2, rids2), key=itemgetter(0)):
+            append_key(k)
+            append_rid(r)
+        return out_keys, out_rids
 
 
     """
     Flush cache for a column with improved batch handling
     """
     def _flush_cache_for_column(self, col):
-        # In flush, if unsorted_cache exists, sort it once
-        if self.unsorted_cache[col]:
-            sorted_unsorted = sorted(self.unsorted_cache[col], key=lambda x: x[0])
-            # Merge with any existing sorted insert_cache
-            if self.insert_cache[col]:
-                cache = self._merge_sorted_lists(self.insert_cache[col], sorted_unsorted)
+        # In flush, if unsorted entries exist, sort them once
+        if self.unsorted_keys[col]:
+            keys = self.unsorted_keys[col]
+            rids = self.unsorted_rids[col]
+            if self.unsorted_is_sorted[col]:
+                # Producer emitted keys in order - skip the sort entirely
+                sorted_keys = keys
+                sorted_rids = rids
             else:
-                cache = sorted_unsorted
-            self.insert_cache[col] = cache
-            self.unsorted_cache[col] = []
-            
-        if not self.insert_cache[col]:
+                order = sorted(range(len(keys)), key=keys.__getitem__)
+                sorted_keys = [keys[i] for i in order]
+                sorted_rids = [rids[i] for i in order]
+            # Merge with any existing sorted insert cache
+            if self.insert_keys[col]:
+                self.insert_keys[col], self.insert_rids[col] = self._merge_sorted_lists(
+                    self.insert_keys[col], self.insert_rids[col], sorted_keys, sorted_rids)
+            else:
+                self.insert_keys[col] = sorted_keys
+                self.insert_rids[col] = sorted_rids
+            self.unsorted_keys[col] = []
+            self.unsorted_rids[col] = []
+            self.unsorted_is_sorted[col] = True
+            self.insert_set[col] |= self.unsorted_set[col]
+            self.unsorted_set[col] = set()
+
+        keys = self.insert_keys[col]
+        if not keys:
             return
-            
+        rids = self.insert_rids[col]
+        # Bind hot objects once - the loop below otherwise re-resolves the
+        # attribute chain and list length every iteration
+        tree = self.indices[col]
+        n = len(keys)
+
         try:
-            batch_size = 5000
-            for i in range(0, len(self.insert_cache[col]), batch_size):
-                batch = self.insert_cache[col][i:i+batch_size]
-                try:
-                    self.indices[col].batch_insert(batch)
-                except ValueError:
-                    for (k, v) in batch:
-                        self.indices[col][k] = v
+            if len(tree) == 0:
+                # Empty tree: a single bottom-up build of the whole sorted run
+                tree.bulk_load(list(zip(keys, rids)))
+            else:
+                batch_size = 5000
+                batch_insert = tree.batch_insert
+                for i in range(0, n, batch_size):
+                    bound = i + batch_size
+                    batch = list(zip(keys[i:bound], rids[i:bound]))
+                    try:
+                        batch_insert(batch)
+                    except ValueError:
+                        for (k, v) in batch:
+                            tree[k] = v
         except Exception as e:
             print(f"Error in batch insert: {e}, falling back to individual inserts")
-            for (k, v) in self.insert_cache[col]:
-                self.indices[col][k] = v
-                
-        if self.insert_cache[col]:
-            if self.max_keys[col] is None or self.insert_cache[col][-1][0] > self.max_keys[col]:
-                self.max_keys[col] = self.insert_cache[col][-1][0]
-        self.insert_cache[col] = []
+            for k, v in zip(keys, rids):
+                tree[k] = v
+
+        if self.max_keys[col] is None or keys[-1] > self.max_keys[col]:
+            self.max_keys[col] = keys[-1]
+        self.insert_keys[col] = []
+        self.insert_rids[col] = []
+        self.insert_set[col] = set()
+        self._dirty_cols.discard(col)
+        # The tree changed - drop the sorted mirror so range scans rebuild it
+        self._col_keys[col] = None
+        self._col_rids[col] = None
+        self._col_keys_arr[col] = None
+
+
+    def set_indirection(self, base_rid, tail_rid):
+        """Record the new head of a base record's version chain"""
+        self.rid_indirection[base_rid] = tail_rid
+
+    def get_indirection(self, base_rid):
+        """Current indirection for a base RID, or None if not cached"""
+        return self.rid_indirection.get(base_rid)
 
 
     """
     Locate a record in the index
     """
     def locate(self, column, value):
-        # For primary key lookups, use cache
-        if column == 0 and value in self.primary_key_cache:
-            return self.primary_key_cache[value].decode('utf-8')
+        # For primary key lookups, use cache (promote hits to MRU position)
+        if column == 0:
+            cached = self.primary_key_cache.get(value)
+            if cached is not None:
+                self.primary_key_cache.move_to_end(value)
+                return cached
         # Instead of flushing all columns, flush only the target column
         self._flush_cache_for_column(column)
         if value is None:
             return False
-        try:
-            val = self.indices[column][value]
-            if val is not None:
-                return val.decode('utf-8')
-        except KeyError:
-            return False
+        # get() returns a sentinel on a miss - no KeyError raise/unwind cost
+        val = self.indices[column].get(value)
+        if val is not None:
+            if column == 0:
+                # Promote the key back into the LRU on a tree hit
+                self.primary_key_cache[value] = val
+                if len(self.primary_key_cache) > self.primary_key_cache_size:
+                    self.primary_key_cache.popitem(last=False)
+            return val
         return False
 
 
@@ -167,39 +320,38 @@ class Index:
     """
     def locate_range(self, begin, end, column):
         """Optimized range query implementation"""
-        # Fast path for primary key column using sorted_records
+        # Fast path for primary key column using the sorted SoA arrays
         if column == 0:
-            # Pre-allocate result with appropriate size estimate
-            result = {}
-            left = bisect.bisect_left(self.sorted_records, (begin, b""))
-            right = bisect.bisect_right(self.sorted_records, (end, b"\xff"))
-            
-            # Use dictionary comprehension for better performance
-            result = {key: rid.decode('utf-8') for key, rid in self.sorted_records[left:right]}
-            return result if result else False
+            keys_arr = self._sorted_pk_array()
+            left = np.searchsorted(keys_arr, begin, side='left')
+            right = np.searchsorted(keys_arr, end, side='right')
+            if left == right:
+                # Empty range - skip the slice/dict allocation entirely
+                return False
+
+            # dict(zip(...)) builds the mapping in C with no per-item bytecode
+            return dict(zip(self.pk_keys[left:right], self.pk_rids[left:right]))
         
         # For other columns
         self._flush_cache_for_column(column)
-        
-        # Start at the first leaf containing values >= begin
-        node = self.indices[column].search(begin)
-        if not node:
+
+        # Rebuild the sorted mirror of this column's tree if stale, then
+        # answer the range with one searchsorted instead of a leaf walk
+        keys_arr = self._col_keys_arr[column]
+        if keys_arr is None:
+            items = self.indices[column].items()
+            if not items:
+                return False
+            self._col_keys[column] = [k for k, _ in items]
+            self._col_rids[column] = [v for _, v in items]
+            keys_arr = np.asarray(self._col_keys[column])
+            self._col_keys_arr[column] = keys_arr
+
+        lo = np.searchsorted(keys_arr, begin, side='left')
+        hi = np.searchsorted(keys_arr, end, side='right')
+        if lo == hi:
             return False
-        
-        result = {}
-        # Traverse leaf nodes without repeated searches
-        while node:
-            for i, k in enumerate(node.keys):
-                if k < begin:
-                    continue
-                if end is not None and k > end:
-                    return result if result else False
-                result[k] = node.children[i].decode('utf-8')
-            
-            # Move to next leaf
-            node = node.next
-        
-        return result if result else False
+        return dict(zip(self._col_keys[column][lo:hi], self._col_rids[column][lo:hi]))
     
     def exists(self, column, value):
         """Fast existence check with early returns"""
@@ -207,25 +359,12 @@ class Index:
         if column == 0 and value in self.primary_key_cache:
             return True
         
-        # Check unsorted and insert caches
-        for cache_key, _ in self.unsorted_cache[column]:
-            if cache_key == value:
-                return True
-                
-        for cache_key, _ in self.insert_cache[column]:
-            if cache_key == value:
-                return True
-                
-        # Only flush if necessary
-        if not self.unsorted_cache[column] and not self.insert_cache[column]:
-            # Direct B+ tree check without flushing caches
-            try:
-                return self.indices[column].has_key(value)
-            except Exception:
-                return False
-        
-        # Full check with cache flush
-        self._flush_cache_for_column(column)
+        # Constant-time membership against both cache layers
+        if value in self.unsorted_set[column] or value in self.insert_set[column]:
+            return True
+
+        # Direct tree check - the sets are exact, so no cache flush is needed,
+        # and has_key already returns False cleanly on a miss
         return self.indices[column].has_key(value)
     
     def __getstate__(self):
@@ -245,24 +384,72 @@ class Index:
         self.__dict__.update(state)
 
 
+"""
+Thin wrapper around sortedcontainers.SortedDict exposing the same API as BPlusTree.
+The hot operations (insert, lookup, range scan) run inside the C-optimized
+sorted container instead of interpreted tree-walk code.
+"""
+class SortedContainerTree:
+    def __init__(self):
+        self._t = SortedDict()
+
+    def __getitem__(self, key):
+        return self._t[key]
+
+    def __setitem__(self, key, value):
+        self._t[key] = value
+
+    def __len__(self):
+        return len(self._t)
+
+    def batch_insert(self, pairs):
+        # SortedDict.update handles unsorted/overlapping keys in one C call
+        self._t.update(pairs)
+
+    def bulk_load(self, sorted_pairs):
+        # SortedDict.update is already a bulk operation
+        self._t.update(sorted_pairs)
+
+    def max_key(self):
+        return self._t.keys()[-1] if self._t else None
+
+    def items(self):
+        return list(self._t.items())
+
+    def has_key(self, key):
+        return key in self._t
+
+    def get(self, key, default=None):
+        return self._t.get(key, default)
+
+
 """
 B+ Tree implementation from scratch
 """
 class BPlusTree:
-    def __init__(self, order=75):
+    def __init__(self, order=75, int_keys=False):
         self.order = order
         self.max_keys = order - 1
-        self.root = BPlusTreeNode(is_leaf=True)
+        # With int_keys, node keys live in array('q') - 8 bytes per key and
+        # C-level comparisons in bisect instead of boxed PyLongs in a list
+        self.int_keys = int_keys
+        self.root = self._new_node(is_leaf=True)
         self._size = 0
 
-    def search(self, key):
+    def _new_node(self, is_leaf=False):
+        node = BPlusTreeNode(is_leaf=is_leaf)
+        if self.int_keys:
+            node.keys = array('q')
+        return node
+
+    def search(self, key, _br=bisect.bisect_right):
         node = self.root
         while not node.is_leaf:
-            i = bisect.bisect_right(node.keys, key)
+            i = _br(node.keys, key)
             node = node.children[i]
         return node
 
-    def __getitem__(self, key):
+    def __getitem__(self, key, _bl=bisect.bisect_left):
         if isinstance(key, slice):
             start, stop = key.start, key.stop
             result = {}
@@ -278,7 +465,7 @@ class BPlusTree:
             return result
         else:
             leaf = self.search(key)
-            i = bisect.bisect_left(leaf.keys, key)
+            i = _bl(leaf.keys, key)
             if i < len(leaf.keys) and leaf.keys[i] == key:
                 return leaf.children[i]
             raise KeyError(f"Key {key} not found")
@@ -286,30 +473,32 @@ class BPlusTree:
     def __setitem__(self, key, value):
         root = self.root
         if len(root.keys) == self.max_keys:
-            new_root = BPlusTreeNode(is_leaf=False)
+            new_root = self._new_node(is_leaf=False)
             new_root.children.append(root)
             self.split_child(new_root, 0)
             self.root = new_root
         self.insert_non_full(self.root, key, value)
         self._size += 1  
 
-    def insert_non_full(self, node, key, value):
-        if node.is_leaf:
-            i = bisect.bisect_left(node.keys, key)
-            node.keys.insert(i, key)
-            node.children.insert(i, value)
-        else:
-            i = bisect.bisect_right(node.keys, key)
+    def insert_non_full(self, node, key, value,
+                        _bl=bisect.bisect_left, _br=bisect.bisect_right):
+        # Iterative descent - avoids one Python frame per tree level
+        while not node.is_leaf:
+            i = _br(node.keys, key)
             child = node.children[i]
             if len(child.keys) == self.max_keys:
                 self.split_child(node, i)
                 if key >= node.keys[i]:
                     i += 1
-            self.insert_non_full(node.children[i], key, value)
+                child = node.children[i]
+            node = child
+        i = _bl(node.keys, key)
+        node.keys.insert(i, key)
+        node.children.insert(i, value)
 
     def split_child(self, parent, index):
         node = parent.children[index]
-        new_node = BPlusTreeNode(is_leaf=node.is_leaf)
+        new_node = self._new_node(is_leaf=node.is_leaf)
         mid = len(node.keys) // 2
         if node.is_leaf:
             new_node.keys = node.keys[mid:]
@@ -336,6 +525,53 @@ class BPlusTree:
         for key, value in pairs:
             self.__setitem__(key, value)
 
+    def bulk_load(self, sorted_pairs):
+        """
+        Build the tree bottom-up from pre-sorted pairs in one pass.
+        Only valid on an empty tree; constructs linked leaves and then each
+        internal level directly - no splits, no recursion, no list.insert.
+        """
+        if len(self) > 0:
+            self.batch_insert(sorted_pairs)
+            return
+        if not sorted_pairs:
+            return
+
+        # Chunk the pairs into linked leaves
+        leaf_size = self.max_keys
+        leaves = []
+        prev = None
+        for i in range(0, len(sorted_pairs), leaf_size):
+            chunk = sorted_pairs[i:i + leaf_size]
+            node = self._new_node(is_leaf=True)
+            node.keys = array('q', (k for k, _ in chunk)) if self.int_keys \
+                else [k for k, _ in chunk]
+            node.children = [v for _, v in chunk]
+            if prev is not None:
+                prev.next = node
+            prev = node
+            leaves.append(node)
+
+        # Build internal levels; track each subtree's minimum key for separators
+        level = leaves
+        mins = [node.keys[0] for node in leaves]
+        while len(level) > 1:
+            parents = []
+            parent_mins = []
+            for i in range(0, len(level), self.order):
+                group = level[i:i + self.order]
+                parent = self._new_node(is_leaf=False)
+                parent.children = group
+                separators = mins[i + 1:i + len(group)]
+                parent.keys = array('q', separators) if self.int_keys else separators
+                parents.append(parent)
+                parent_mins.append(mins[i])
+            level = parents
+            mins = parent_mins
+
+        self.root = level[0]
+        self._size = len(sorted_pairs)
+
     def max_key(self):
         node = self.root
         while not node.is_leaf:
@@ -347,7 +583,6 @@ class BPlusTree:
 
     # Add a method to get all key-value pairs
     def items(self):
-        __slots__ = ('is_leaf', 'keys', 'children', 'next')
         """Get all key-value pairs in the tree"""
         result = []
         node = self.root
@@ -359,21 +594,33 @@ class BPlusTree:
                 result.append((k, v))
             node = node.next
         return result
-    
-    def has_key(self, key):
+
+    def has_key(self, key, _bl=bisect.bisect_left):
         """
         Check if key exists in the tree without retrieving value
         Much faster than __getitem__ for existence checks
         """
         try:
             leaf = self.search(key)
-            i = bisect.bisect_left(leaf.keys, key)
+            i = _bl(leaf.keys, key)
             return i < len(leaf.keys) and leaf.keys[i] == key
         except:
             return False
 
+    def get(self, key, default=None, _bl=bisect.bisect_left):
+        """Return the value for key, or default on a miss - no KeyError"""
+        leaf = self.search(key)
+        i = _bl(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf.children[i]
+        return default
+
 
 class BPlusTreeNode:
+    # Trees hold one node object per ~order keys; slots drop the per-node
+    # __dict__ and make attribute access a fixed-offset load
+    __slots__ = ('is_leaf', 'keys', 'children', 'next')
+
     def __init__(self, is_leaf=False):
         self.is_leaf = is_leaf
         self.keys = []
@@ -34,6 +34,10 @@ class Page:
     def read_index(self, index):  # Read record at index
         return self.data[index]
 
+    def read_column_at(self, col_idx, offsets):  # Read one column at the given offsets
+        data = self.data
+        return [data[i].columns[col_idx] for i in offsets]
+
     def serialize(self):
         """
         Serialize page data into bytes for disk storage
@@ -68,26 +72,38 @@ class Page:
             Page: Reconstructed page object
         """
         # Import here to avoid circular import
-        from lstore.table import Record
-        
+        from lstore.table import Record, rid_from_str
+
         # Create new page
         page = cls()
-        
+
         # Unpack the serialized data
         page_data = msgpack.unpackb(data)
-        
+
         # Set page metadata
         page.num_records = page_data['num_records']
-        
-        # Reconstruct records
+
+        # Reconstruct records; pages written before RIDs became ints carry
+        # "b12"/"t34" strings and are translated on load
         for record_data in page_data['records']:
-            record = Record(
-                record_data['base_rid'],
-                record_data['indirection'],
-                record_data['rid'], 
-                record_data['start_time'],
-                record_data['schema_encoding'],
-                record_data['columns']
-            )
+            rid = record_data['rid']
+            if isinstance(rid, str):
+                record = Record(
+                    rid_from_str(record_data['base_rid']),
+                    rid_from_str(record_data['indirection']),
+                    rid_from_str(rid),
+                    record_data['start_time'],
+                    record_data['schema_encoding'],
+                    record_data['columns']
+                )
+            else:
+                record = Record(
+                    record_data['base_rid'],
+                    record_data['indirection'],
+                    rid,
+                    record_data['start_time'],
+                    record_data['schema_encoding'],
+                    record_data['columns']
+                )
             page.data.append(record)
         return page
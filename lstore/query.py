@@ -1,9 +1,14 @@
 import os
-import time
-import copy
-from lstore.table import Record
+from collections import defaultdict
+from time import time as _now
+from lstore.table import Record, make_base_rid, make_tail_rid
 from lstore.page import Page
-from lstore.config import MERGE_THRESH, PAGE_RANGE_SIZE
+from lstore.config import PAGE_RANGE_SIZE
+
+# Age-based eviction: how often (in tail writes) to sweep the bufferpool and
+# how long an unpinned page may sit idle before being evicted
+STALE_SWEEP_INTERVAL = 4096
+STALE_PAGE_AGE_NS = 5_000_000_000
 
 class Query:
     """
@@ -26,62 +31,67 @@ class Query:
     # Returns True upon succesful deletion
     # Return False if record doesn't exist or is locked due to 2PL
     """
-    def delete(self, primary_key):
+    def delete(self, primary_key, _rid=None):
+        table = self.table
+        pd = table.page_directory
+        bp = table.bufferpool
+
         # Locate base record
-        base_rid = self.table.index.locate(0, primary_key)
-        if base_rid is False or not base_rid:
+        base_rid = table.index.locate(0, primary_key) if _rid is None else _rid
+        if base_rid is False:
             return False
-        if isinstance(base_rid, bytes):
-            base_rid = base_rid.decode()
 
         # Retrieve base record
-        base_path, base_offset = self.table.page_directory[base_rid]
-        base_record = self.table.bufferpool.get_page(base_path).read_index(base_offset)
-        self.table.bufferpool.unpin_page(base_path)
+        base_path, base_offset = pd[base_rid]
+        with bp.pinned(base_path) as base_page:
+            base_record = base_page.read_index(base_offset)
 
         # Get last tail record
-        last_tail_path, last_tail_offset = self.table.page_directory[base_record.indirection]
-        last_tail_record = self.table.bufferpool.get_page(last_tail_path).read_index(last_tail_offset)
-        self.table.bufferpool.unpin_page(last_tail_path)
+        last_tail_path, last_tail_offset = pd[base_record.indirection]
+        with bp.pinned(last_tail_path) as last_tail_page:
+            last_tail_record = last_tail_page.read_index(last_tail_offset)
 
         # Create deletion marker record
+        tail_seq = table.new_tail_rid_seq()
         record = Record(
             base_record.rid,
             last_tail_record.rid,
-            f"t{self.table.current_tail_rid}",
-            time.time(),
+            make_tail_rid(tail_seq),
+            _now(),
             [0] * len(base_record.schema_encoding),
             [None] * len(base_record.columns)
         )
 
-        # Get pagerange index from base path
-        base_pagerange_index = int(base_path.split("pagerange_")[1].split("/")[0])
+        # Get pagerange index from base path (parsed once per path, then cached)
+        base_pagerange_index = table.path_indices(base_path)[0]
 
-        tail_path = self.table.tail_page_locations[base_pagerange_index]
-        tail_page = self.table.bufferpool.get_page(tail_path)
+        tail_path = table.tail_page_locations[base_pagerange_index]
+        tail_page = bp.get_page(tail_path)
 
         # Write to appropriate page
         if tail_page.has_capacity():
             tail_page.write(record)
             insert_path, offset = tail_path, tail_page.num_records - 1
         else:
-            new_path = f"{self.table.path}/pagerange_{base_pagerange_index}/tail/page_{len(self.table.tail_page_locations)-1}"
+            new_path = f"{table.path}/pagerange_{base_pagerange_index}/tail/page_{len(table.tail_page_locations)-1}"
             new_page = Page()
             new_page.write(record)
-            self.table.bufferpool.add_frame(new_path, new_page)
-            self.table.tail_page_locations[base_pagerange_index] = new_path
+            bp.add_frame(new_path, new_page)
+            table.tail_page_locations[base_pagerange_index] = new_path
             insert_path, offset = new_path, 0
 
         # Update metadata
-        self.table.bufferpool.unpin_page(tail_path)
-        self.table.page_directory[record.rid] = [insert_path, offset]
-        self.table.index.add_record(record)
-        self.table.current_tail_rid += 1
+        bp.unpin_page(tail_path)
+        pd[record.rid] = [insert_path, offset]
+        table.index.add_record(record)
 
-        # Handle merge threshold
-        self.table.pr_unmerged_updates[base_pagerange_index] += 1
-        if self.table.pr_unmerged_updates[base_pagerange_index] >= MERGE_THRESH:
-            self.table.merge(base_pagerange_index)
+        # Merge triggering happens on the table's poller thread
+        table.register_update(base_pagerange_index)
+
+        # Amortized age-based eviction keeps long write runs from holding
+        # cold pages resident
+        if tail_seq % STALE_SWEEP_INTERVAL == 0:
+            bp.evict_stale(STALE_PAGE_AGE_NS)
 
         return True
 
@@ -93,25 +103,27 @@ class Query:
     # FOR BASE PAGES
     """
     def insert(self, *columns):
-        # Check if primary key already exists   
-        primary_key = list(columns)[0]
+        # Check if primary key already exists
+        primary_key = columns[0]
         does_exist = self.table.index.exists(0, primary_key)
         if does_exist:
             return False
-        
-        record = Record(f"b{self.table.current_base_rid}", f"b{self.table.current_base_rid}", f"b{self.table.current_base_rid}", time.time(), [0] * len(columns), [*columns])
+
+        rid = make_base_rid(self.table.current_base_rid)
+        record = Record(rid, rid, rid, _now(), [0] * len(columns), list(columns))
         self.table.index.add_record(record)
         
-        last_path = self.table.base_page_locations[len(self.table.base_page_locations) - 1]
+        # last_path is maintained as the current insert target, so skip the
+        # len()-1 re-derivation from the locations list
+        last_path = self.table.last_path
         last_page = self.table.bufferpool.get_page(last_path)
         self.table.bufferpool.unpin_page(last_path)
-        last_pagerange_index, last_page_index = self._parse_page_path(last_path)
+        last_pagerange_index, last_page_index = self.table.path_indices(last_path)
         
         if last_page.has_capacity():
             last_page.write(record)
             self.table.bufferpool.mark_dirty(last_path)
-            self.table.base_page_locations[last_pagerange_index] = last_path
-            insert_path = self.table.last_path
+            insert_path = last_path
             offset = last_page.num_records - 1
         else:
             new_page = Page() 
@@ -123,10 +135,17 @@ class Query:
             if last_page_index + 1 < PAGE_RANGE_SIZE:
                 insert_path = f"{self.table.path}/pagerange_{last_pagerange_index}/base/page_{last_page_index + 1}"
                 self.table.base_page_locations[last_pagerange_index] = insert_path
+                # Halfway through the pagerange, start creating the next
+                # one's directories in the background
+                if last_page_index + 1 >= PAGE_RANGE_SIZE // 2:
+                    self.table.preallocate_next_pagerange(last_pagerange_index + 1)
             else:
                 new_pagerange_path = f"{self.table.path}/pagerange_{last_pagerange_index + 1}"
-                os.makedirs(f"{new_pagerange_path}/base", exist_ok=True)
-                os.makedirs(f"{new_pagerange_path}/tail", exist_ok=True)
+                if self.table._preallocated_pagerange < last_pagerange_index + 1:
+                    # Preallocation hasn't landed - fall back to inline
+                    # makedirs (idempotent against a racing prealloc thread)
+                    os.makedirs(f"{new_pagerange_path}/base", exist_ok=True)
+                    os.makedirs(f"{new_pagerange_path}/tail", exist_ok=True)
                 insert_path = f"{new_pagerange_path}/base/page_0"
                 self.table.page_range_tps.append(0)
                 self.table.tail_page_locations.append(f"{new_pagerange_path}/tail/page_0")
@@ -141,25 +160,11 @@ class Query:
             self.table.last_path = insert_path
             self.table.bufferpool.add_frame(insert_path, new_page)
         
-        self.table.page_directory[f"b{self.table.current_base_rid}"] = [insert_path, offset]
+        self.table.page_directory[rid] = [insert_path, offset]
         self.table.current_base_rid += 1
         return True
     
 
-    def _parse_page_path(self, path):
-        # Extract pagerange index and page index from a path
-        try:
-            pagerange_part = path.split("pagerange_")[1]
-            pagerange_index = int(pagerange_part.split("/")[0])
-            page_part = path.split("page_")[1]
-            # Remove potential file extension if present.
-            page_index = int(page_part.split("/")[0].split('.')[0])
-            return pagerange_index, page_index
-        except Exception as e:
-            print("Error parsing page path:", e)
-            return 0, 0
-
-    
     """
     # Read matching record with specified search key
     # :param search_key: the value you want to search based on
@@ -169,32 +174,68 @@ class Query:
     # Returns False if record locked by TPL
     # Assume that select will never be called on a key that doesn't exist
     """
-    def select(self, search_key, search_key_index, projected_columns_index):
-        rid_combined_string = self.table.index.locate(search_key_index, search_key)
-        
-        if rid_combined_string == False:
+    def select(self, search_key, search_key_index, projected_columns_index, _rid=None):
+        if _rid is not None and search_key_index == 0:
+            located_rid = _rid
+        else:
+            located_rid = self.table.index.locate(search_key_index, search_key)
+
+        if located_rid is False:
             return False
-        
-        rid_list = rid_combined_string.split(",")
-        # Merge the lineage
-        records = []   
-        for rid in rid_list:
-            base_path, base_offset = self.table.page_directory[rid]
-            base_page = self.table.bufferpool.get_page(base_path)
-            tail_rid = base_page.read_index(base_offset).indirection
-            self.table.bufferpool.unpin_page(base_path)
-            
-            tail_path, tail_offset = self.table.page_directory[tail_rid]
-            tail_page = self.table.bufferpool.get_page(tail_path)
+
+        rid_list = [located_rid]
+        # Full projections reuse the tail record's columns list; partial ones
+        # gather through an index tuple computed once per call instead of a
+        # zip-and-compare per record
+        proj = None if all(projected_columns_index) else tuple(
+            i for i, bit in enumerate(projected_columns_index) if bit)
+        # Bind the hot attribute chains once - the loop pays one LOAD_FAST
+        # per access instead of two LOAD_ATTRs
+        pd = self.table.page_directory
+        bp = self.table.bufferpool
+        get_page = bp.get_page
+        unpin = bp.unpin_page
+
+        # The index caches each base record's current indirection, so most
+        # RIDs resolve straight to their tail location; only cache misses
+        # fall back to a (page-grouped) base read
+        get_indirection = self.table.index.rid_indirection.get
+        tail_locations = [None] * len(rid_list)
+        base_groups = defaultdict(list)
+        for pos, rid in enumerate(rid_list):
+            tail_rid = get_indirection(rid)
+            if tail_rid is not None:
+                tail_locations[pos] = pd[tail_rid]
+            else:
+                base_path, base_offset = pd[rid]
+                base_groups[base_path].append((pos, base_offset))
+
+        for base_path, items in base_groups.items():
+            read_index = get_page(base_path).read_index
+            for pos, base_offset in items:
+                tail_locations[pos] = pd[read_index(base_offset).indirection]
+            unpin(base_path)
+
+        # Merge the lineage, keeping each tail page pinned across all of
+        # its reads
+        records = []
+        tail_pages = {}
+        for tail_path, tail_offset in tail_locations:
+            tail_page = tail_pages.get(tail_path)
+            if tail_page is None:
+                tail_page = get_page(tail_path)
+                tail_pages[tail_path] = tail_page
             tail_record = tail_page.read_index(tail_offset)
-            
-            new_record = Record(tail_record.base_rid, tail_record.indirection, tail_record.rid, tail_record.start_time, tail_record.schema_encoding,[element for element, bit in 
-                                zip(tail_record.columns, projected_columns_index) if bit == 1])
+
+            cols = tail_record.columns
+            projected = cols if proj is None else [cols[i] for i in proj]
+            new_record = Record(tail_record.base_rid, tail_record.indirection, tail_record.rid, tail_record.start_time, tail_record.schema_encoding, projected)
             if new_record:
                 records.append(new_record)
-            
-            self.table.bufferpool.unpin_page(tail_path)
-        
+
+        for tail_path in tail_pages:
+            unpin(tail_path)
+
         return records if records else False
 
     """
@@ -209,18 +250,31 @@ class Query:
     # RELATIVE_VERSION USAGE: (-1, -2, etc)
     """
     def select_version(self, search_key, search_key_index, projected_columns_index, relative_version):
+        # Version 0 is the current record - no chain walk needed
+        if relative_version == 0:
+            return self.select(search_key, search_key_index, projected_columns_index)
+
         rids_combined = self.table.index.locate(search_key_index, search_key)
         
-        if not rids_combined:
+        if rids_combined is False or rids_combined is None:
             print("No records found", search_key, search_key_index)
             return None
         
-        rid_list = rids_combined.split(",")
+        rid_list = [rids_combined]
+        proj = None if all(projected_columns_index) else tuple(
+            i for i, bit in enumerate(projected_columns_index) if bit)
+        # Hoist the hop count and the per-hop attribute chains out of the
+        # walk - the loop below runs hops times per RID
+        hops = abs(relative_version - 2)
+        pd = self.table.page_directory
+        bp = self.table.bufferpool
+        get_page = bp.get_page
+        unpin = bp.unpin_page
         # Here, each element in record_lineages is already a lineage (a list of records)
         results = []
         for rid in rid_list:
             temp_rid = rid
-            
+
             # for i in range(abs(relative_version - 2)):
             #     reached_deleted_record = False 
             #     # Skip over deleted records
@@ -233,19 +287,17 @@ class Query:
             #             continue
             #         break
             
-            for i in range(abs(relative_version-2)):
-                
-                temp_record_path, offset = self.table.page_directory[temp_rid]
-                temp_record = self.table.bufferpool.get_page(temp_record_path).read_index(offset)    
-                #print(f"Iteration {i} Temp rid: {temp_rid}, Record: {temp_record}")
-                temp_rid = temp_record.indirection  
+            for i in range(hops):
+                temp_record_path, offset = pd[temp_rid]
+                temp_record = get_page(temp_record_path).read_index(offset)
+                temp_rid = temp_record.indirection
+                unpin(temp_record_path)
                 if temp_rid == temp_record.base_rid:
-                    self.table.bufferpool.unpin_page(temp_record_path)
                     break
-                self.table.bufferpool.unpin_page(temp_record_path)
             
-            modified_record = Record(temp_record.base_rid, temp_record.indirection, temp_record.rid, temp_record.start_time, temp_record.schema_encoding,[element for element, bit in 
-                                zip(temp_record.columns, projected_columns_index) if bit == 1])
+            cols = temp_record.columns
+            projected = cols if proj is None else [cols[i] for i in proj]
+            modified_record = Record(temp_record.base_rid, temp_record.indirection, temp_record.rid, temp_record.start_time, temp_record.schema_encoding, projected)
             results.append(modified_record)
             
         return results
@@ -257,112 +309,140 @@ class Query:
     # Returns False if no records exist with given key or if the target record cannot be accessed due to 2PL locking
     # FOR TAIL PAGES
     """
-    def update(self, primary_key, *columns):
-        base_rid = self.table.index.locate(0, primary_key)
-        if base_rid is False or not base_rid:
+    def update(self, primary_key, *columns, _rid=None):
+        changes = [(i, c) for i, c in enumerate(columns) if c is not None]
+        return self._update_impl(primary_key, changes, _rid=_rid)
+
+
+    """
+    # Single-column variant of update: no [None]*num_columns scaffolding on
+    # either side of the call
+    """
+    def update_single(self, primary_key, column_index, value, _rid=None):
+        return self._update_impl(primary_key, ((column_index, value),), _rid=_rid)
+
+
+    def _changes_schema(self, changes):
+        schema = [0] * self.table.num_columns
+        for i, _ in changes:
+            schema[i] = 1
+        return schema
+
+
+    def _update_impl(self, primary_key, changes, _rid=None):
+        table = self.table
+        pd = table.page_directory
+        bp = table.bufferpool
+
+        base_rid = table.index.locate(0, primary_key) if _rid is None else _rid
+        if base_rid is False:
             return False
-        if isinstance(base_rid, bytes):
-            base_rid = base_rid.decode()
 
         # Retrieve base record
-        base_path, base_offset = self.table.page_directory[base_rid]
-        base_record = self.table.bufferpool.get_page(base_path).read_index(base_offset)
+        base_path, base_offset = pd[base_rid]
+        with bp.pinned(base_path) as base_page:
+            base_record = base_page.read_index(base_offset)
 
-        is_first_update = base_record.indirection == base_record.rid
+            # Both the first-update branch and the tail write below need these;
+            # compute/bind them once (cached parse)
+            base_pagerange_index = table.path_indices(base_path)[0]
+            tail_locations = table.tail_page_locations
 
-        if not is_first_update:
-            last_tail_path, last_tail_offset = self.table.page_directory[base_record.indirection]
-            last_tail_record = self.table.bufferpool.get_page(last_tail_path).read_index(last_tail_offset)
-            self.table.bufferpool.unpin_page(last_tail_path)
-        else:
-            # Extract pagerange index from base_path efficiently
-            base_pagerange_index = int(base_path.split("pagerange_")[1].split("/")[0])
-            original_copy = Record(
-                base_record.rid,
+            is_first_update = base_record.indirection == base_record.rid
+
+            if not is_first_update:
+                last_tail_path, last_tail_offset = pd[base_record.indirection]
+                with bp.pinned(last_tail_path) as last_tail_page:
+                    last_tail_record = last_tail_page.read_index(last_tail_offset)
+            else:
+                original_copy = Record(
+                    base_record.rid,
+                    base_record.rid,
+                    make_tail_rid(table.new_tail_rid_seq()),
+                    _now(),
+                    self._changes_schema(changes),
+                    base_record.columns
+                )
+
+                current_tail_path = tail_locations[base_pagerange_index]
+                #print(bp)
+                current_tail_page = bp.get_page(current_tail_path)
+            
+                # Handle page capacity
+                if current_tail_page.has_capacity():
+                    offset = current_tail_page.num_records
+                    current_tail_page.write(original_copy)
+                    insert_path = current_tail_path
+                else:
+                    new_path = f"{table.path}/pagerange_{base_pagerange_index}/tail/page_{table.tail_page_indices[base_pagerange_index]+1}"
+                    new_page = Page()
+                    offset = 0
+                    new_page.write(original_copy)
+                    table.tail_page_indices[base_pagerange_index] += 1
+                    bp.add_frame(new_path, new_page)
+                    bp.mark_dirty(current_tail_path)
+                    tail_locations[base_pagerange_index] = new_path
+                    insert_path = new_path
+
+                pd[original_copy.rid] = [insert_path, offset]
+                last_tail_record = original_copy
+                bp.unpin_page(current_tail_path)
+        
+            # Prepare new record: C-level slice copies of the previous version,
+            # then blend in only the slots the caller actually set. Sparse
+            # updates touch k slots instead of branching on all n.
+            new_schema = last_tail_record.schema_encoding[:]
+            new_cols = last_tail_record.columns[:]
+            for i, c in changes:
+                new_schema[i] = 1
+                new_cols[i] = c
+
+            tail_seq = table.new_tail_rid_seq()
+            record = Record(
                 base_record.rid,
-                f"t{self.table.current_tail_rid}",
-                time.time(),
-                [1 if col is not None else 0 for col in columns],
-                base_record.columns
+                last_tail_record.rid,
+                make_tail_rid(tail_seq),
+                _now(),
+                new_schema,
+                new_cols
             )
-            self.table.current_tail_rid += 1
 
-            current_tail_path = self.table.tail_page_locations[base_pagerange_index]
-            #print(self.table.bufferpool)
-            current_tail_page = self.table.bufferpool.get_page(current_tail_path)
-            
-            # Handle page capacity
+            # Update base record pointers
+            base_record.schema_encoding = new_schema
+            base_record.indirection = record.rid
+            table.index.set_indirection(base_record.rid, record.rid)
+            bp.mark_dirty(base_path)
+
+            # Write new tail record (re-read the tail slot - the first-update
+            # branch may have rolled it to a new page)
+            current_tail_path = tail_locations[base_pagerange_index]
+            current_tail_page = bp.get_page(current_tail_path)
+
             if current_tail_page.has_capacity():
                 offset = current_tail_page.num_records
-                current_tail_page.write(original_copy)
+                current_tail_page.write(record)
+                bp.mark_dirty(current_tail_path)
                 insert_path = current_tail_path
             else:
-                new_path = f"{self.table.path}/pagerange_{base_pagerange_index}/tail/page_{self.table.tail_page_indices[base_pagerange_index]+1}"
+                new_path = f"{table.path}/pagerange_{base_pagerange_index}/tail/page_{table.tail_page_indices[base_pagerange_index]+1}"
                 new_page = Page()
                 offset = 0
-                new_page.write(original_copy)
-                self.table.tail_page_indices[base_pagerange_index] += 1
-                self.table.bufferpool.add_frame(new_path, new_page)
-                self.table.bufferpool.mark_dirty(current_tail_path)
-                self.table.tail_page_locations[base_pagerange_index] = new_path
+                new_page.write(record)
+                bp.add_frame(new_path, new_page)
+                bp.mark_dirty(new_path)
+                tail_locations[base_pagerange_index] = new_path
+                table.tail_page_indices[base_pagerange_index] += 1
                 insert_path = new_path
 
-            self.table.page_directory[original_copy.rid] = [insert_path, offset]
-            last_tail_record = original_copy
-            self.table.bufferpool.unpin_page(current_tail_path)
-        
-        # Prepare new record
-        schema_len = len(columns)
-        new_schema = [(1 if columns[i] is not None else last_tail_record.schema_encoding[i]) for i in range(schema_len)]
-        new_cols = [(columns[i] if columns[i] is not None else last_tail_record.columns[i]) for i in range(schema_len)]
-
-        record = Record(
-            base_record.rid,
-            last_tail_record.rid,
-            f"t{self.table.current_tail_rid}",
-            time.time(),
-            new_schema,
-            new_cols
-        )
+            pd[record.rid] = [insert_path, offset]
 
-        # Update base record pointers
-        base_record.schema_encoding = new_schema
-        base_record.indirection = record.rid
-        self.table.bufferpool.mark_dirty(base_path)
-        self.table.bufferpool.unpin_page(base_path)
+            # Merge triggering happens on the table's poller thread
+            table.register_update(base_pagerange_index)
 
-        # Write new tail record
-        base_pagerange_index = int(base_path.split("pagerange_")[1].split("/")[0])
-        
-        current_tail_path = self.table.tail_page_locations[base_pagerange_index]
-        current_tail_page = self.table.bufferpool.get_page(current_tail_path)
-
-        if current_tail_page.has_capacity():
-            offset = current_tail_page.num_records
-            current_tail_page.write(record)
-            self.table.bufferpool.mark_dirty(current_tail_path)
-            insert_path = current_tail_path
-        else:
-            new_path = f"{self.table.path}/pagerange_{base_pagerange_index}/tail/page_{self.table.tail_page_indices[base_pagerange_index]+1}"
-            new_page = Page()
-            offset = 0
-            new_page.write(record)
-            self.table.bufferpool.add_frame(new_path, new_page)
-            self.table.bufferpool.mark_dirty(new_path)
-            self.table.tail_page_locations[base_pagerange_index] = new_path
-            self.table.tail_page_indices[base_pagerange_index] += 1
-            insert_path = new_path
-
-        self.table.page_directory[record.rid] = [insert_path, offset]
-        self.table.current_tail_rid += 1
-
-        # Merge logic
-        self.table.pr_unmerged_updates[base_pagerange_index] += 1
-        if self.table.pr_unmerged_updates[base_pagerange_index] >= MERGE_THRESH:
-            self.table.merge(base_pagerange_index)
-            
-        self.table.bufferpool.unpin_page(current_tail_path)
-        return True
+            bp.unpin_page(current_tail_path)
+            if tail_seq % STALE_SWEEP_INTERVAL == 0:
+                bp.evict_stale(STALE_PAGE_AGE_NS)
+            return True
 
     
     """
@@ -374,24 +454,40 @@ class Query:
     # Returns False if no record exists in the given range
     """
     def sum(self, start_range, end_range, aggregate_column_index):
-        # Use locate_range to obtain a dictionary mapping keys to decoded RID strings
+        # Use locate_range to obtain a dictionary mapping keys to RIDs
         rid_dict = self.table.index.locate_range(start_range, end_range, 0)
         if not rid_dict:
             return False
-        # Get the list of RID strings from the dictionary values
-        rids = list(rid_dict.values())
+        pd = self.table.page_directory
+        bp = self.table.bufferpool
+
+        # Resolve indirections through the index cache where possible; only
+        # cache misses pay for a (page-grouped) base read
+        get_indirection = self.table.index.rid_indirection.get
+        tail_groups = defaultdict(list)
+        base_groups = defaultdict(list)
+        for rid in rid_dict.values():
+            tail_rid = get_indirection(rid)
+            if tail_rid is not None:
+                tail_path, tail_offset = pd[tail_rid]
+                tail_groups[tail_path].append(tail_offset)
+            else:
+                base_path, base_offset = pd[rid]
+                base_groups[base_path].append(base_offset)
+
+        for base_path, offsets in base_groups.items():
+            base_page = bp.get_page(base_path)
+            read_index = base_page.read_index
+            for offset in offsets:
+                tail_path, tail_offset = pd[read_index(offset).indirection]
+                tail_groups[tail_path].append(tail_offset)
+            bp.unpin_page(base_path)
+
         range_sum = 0
-        for rid in rids:
-            base_path, base_offset = self.table.page_directory[rid]
-            base_page = self.table.bufferpool.get_page(base_path)
-            tail_rid = base_page.read_index(base_offset).indirection
-            self.table.bufferpool.unpin_page(base_path)
-            
-            tail_path, tail_offset = self.table.page_directory[tail_rid]
-            tail_page = self.table.bufferpool.get_page(tail_path)
-            tail_record = tail_page.read_index(tail_offset)
-            
-            range_sum += tail_record.columns[aggregate_column_index]
+        for tail_path, offsets in tail_groups.items():
+            tail_page = bp.get_page(tail_path)
+            range_sum += sum(tail_page.read_column_at(aggregate_column_index, offsets))
+            bp.unpin_page(tail_path)
         return range_sum
       
     
@@ -411,20 +507,53 @@ class Query:
 
             return False
         rids = list(rids.values())
-        
-        
-        for rid in rids:     
+
+        # Same hoisting as select_version: hop count and hot callables
+        # resolved once, not per hop
+        hops = abs(relative_version - 2)
+        pd = self.table.page_directory
+        bp = self.table.bufferpool
+        get_page = bp.get_page
+        unpin = bp.unpin_page
+
+        for rid in rids:
             temp_rid = rid
-            for i in range(abs(relative_version-2)):
-                temp_record_path, offset = self.table.page_directory[temp_rid]
-                temp_record = self.table.bufferpool.get_page(temp_record_path).read_index(offset)
-                self.table.bufferpool.unpin_page(temp_record_path)
+            for i in range(hops):
+                temp_record_path, offset = pd[temp_rid]
+                temp_record = get_page(temp_record_path).read_index(offset)
+                unpin(temp_record_path)
                 temp_rid = temp_record.indirection
-                       
+                if temp_rid == temp_record.base_rid:
+                    break
+
             range_sum += temp_record.columns[aggregate_column_index]
         return range_sum
         
 
+    def get_column(self, primary_key, column_index):
+        """
+        Read one column of a record's latest version.
+        Returns the value, or None if no record matches the key.
+        No Record object or projection list is materialized.
+        """
+        table = self.table
+        rid = table.index.locate(0, primary_key)
+        if rid is False:
+            return None
+        pd = table.page_directory
+        bp = table.bufferpool
+
+        tail_rid = table.index.rid_indirection.get(rid)
+        if tail_rid is None:
+            base_path, base_offset = pd[rid]
+            with bp.pinned(base_path) as base_page:
+                tail_rid = base_page.read_index(base_offset).indirection
+
+        tail_path, tail_offset = pd[tail_rid]
+        with bp.pinned(tail_path) as tail_page:
+            return tail_page.read_index(tail_offset).columns[column_index]
+
+
     """
     incremenets one column of the record
     this implementation should work if your select and update queries already work
@@ -434,10 +563,7 @@ class Query:
     # Returns False if no record matches key or if target record is locked by 2PL.
     """
     def increment(self, key, column):
-        r = self.select(key, self.table.key, [1] * self.table.num_columns)[0]
-        if r is not False:
-            updated_columns = [None] * self.table.num_columns
-            updated_columns[column] = r[column] + 1
-            u = self.update(key, *updated_columns)
-            return u
-        return False
+        value = self.get_column(key, column)
+        if value is None:
+            return False
+        return self.update_single(key, column, value + 1)
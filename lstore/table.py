@@ -3,16 +3,39 @@ import threading
 import time
 import traceback
 from lstore.index import Index
-from lstore.config import PAGE_SIZE, PAGE_RANGE_SIZE
+from lstore.config import PAGE_SIZE, PAGE_RANGE_SIZE, MERGE_THRESH
 from lstore.bufferpool import BufferPool
 from lstore.page import Page
 import copy
 
+# RIDs are 64-bit ints: bit 62 tags tail records, the lower bits hold the
+# allocation sequence. Int keys hash far cheaper than the old "b12"/"t34"
+# strings and cost no string allocation per insert/update.
+TAIL_RID_TAG = 1 << 62
+
+def make_base_rid(n):
+    return n
+
+def make_tail_rid(n):
+    return TAIL_RID_TAG | n
+
+def rid_is_tail(rid):
+    return rid >= TAIL_RID_TAG
+
+def rid_seq(rid):
+    return rid & (TAIL_RID_TAG - 1)
+
+def rid_from_str(rid):
+    """Translate a legacy on-disk string RID ("b12"/"t34") to the int form"""
+    n = int(rid[1:])
+    return (TAIL_RID_TAG | n) if rid[0] == 't' else n
+
+
 class Record:
 
     def __init__(self, base_rid, indirection, rid, start_time, schema_encoding, columns, last_updated_time=None):
         self.indirection = indirection          # points to rid of previous versioned record. base record points to most recent record -> next most recent
-        self.rid = rid                          # rid = 'b' + base_rid for base record, rid = 't' + tail_rid for tail record
+        self.rid = rid                          # int RID; tail records carry TAIL_RID_TAG (see helpers above)
         self.start_time = start_time
         self.schema_encoding = schema_encoding  # bit list of 0's and 1's
         self.columns = columns                  # primary key is the first column
@@ -28,14 +51,19 @@ class Table:
     :param num_columns: int     #Number of Columns: all columns are integer
     :param key: int             #Index of table key in columns
     """
+    _name_to_id = {}    # {table_name: small int} - interned ids for tuple lock IDs
+
     def __init__(self, name, num_columns, key, db_path):
         # Table metadata
         self.name = name                                    # specifies table_name
+        self.lock_table_id = Table._name_to_id.setdefault(name, len(Table._name_to_id))
         self.key = key                                      # specifies table_name_v
         self.num_columns = num_columns
         self.path = os.path.join(db_path,"_tables", name)   # On disk file path
         self.pr_unmerged_updates = [0]                      # Unmerged updates per page range
         self.page_directory = {}                            # {rid: (path, offset)} for each record
+        self._path_indices = {}                             # {path: (pagerange_index, page_index)} parse cache
+        self._lock_id_cache = {}                            # {rid: lock-id tuple} memo for Transaction._get_lock_ids
         self.index = Index(self)                            # Index object for this table (glorifed b+ tree storing <rid,value> pairs) 
         self.bufferpool = BufferPool(self.path)             # Bufferpool object for this table
         self.tail_page_locations = []                       # {page_range_index: path_to_last_tail_page} for each page range
@@ -45,6 +73,18 @@ class Table:
         self.last_path = os.path.join(self.path, "pagerange_0/base/page_0") # Path to last base page on disk (for insert)
         self.current_base_rid = 0                           # Rid of last base record
         self.current_tail_rid = 0                           # Rid of last tail record
+        self._tail_rid_lock = threading.Lock()              # Writers in different pageranges allocate concurrently
+
+        # Pagerange preallocation: directories for the next pagerange are
+        # created by a background thread before insert needs them
+        self._preallocated_pagerange = 0
+        self._prealloc_thread = None
+
+        # Merge polling: writers only bump a counter; a lazily started
+        # daemon thread watches the counters and dispatches merges
+        self._merge_poller = None
+        self._merge_poller_lock = threading.Lock()
+        self._merge_poller_stop = threading.Event()
 
         # Merging attributes
         self.merge_count = 0
@@ -78,7 +118,75 @@ class Table:
 
     def __repr__(self):
         return f"Name: {self.name}\nKey: {self.key}\nNum columns: {self.num_columns}\nPage_directory: {self.page_directory}\nindex: {self.index}"
-    
+
+
+    def new_tail_rid_seq(self):
+        """Allocates the next tail-rid sequence number. Locked because
+        writers to different pageranges may run concurrently"""
+        with self._tail_rid_lock:
+            seq = self.current_tail_rid
+            self.current_tail_rid = seq + 1
+            return seq
+
+    def register_update(self, pagerange_index):
+        """Count an update against a pagerange. The merge-threshold check
+        runs on the poller thread, keeping the write path to one increment"""
+        self.pr_unmerged_updates[pagerange_index] += 1
+        if self._merge_poller is None:
+            with self._merge_poller_lock:
+                if self._merge_poller is None:
+                    poller = threading.Thread(target=self._merge_poll_loop, daemon=True)
+                    self._merge_poller = poller
+                    poller.start()
+
+    def _merge_poll_loop(self):
+        stop = self._merge_poller_stop
+        while not stop.wait(0.05):
+            counts = self.pr_unmerged_updates
+            for pagerange_index in range(len(counts)):
+                if counts[pagerange_index] >= MERGE_THRESH:
+                    self.merge(pagerange_index)
+
+
+    def stop_merge_poller(self):
+        """Stop the merge poller and wait for it, so no new merge can be
+        dispatched while the table is being saved. The poller does not
+        restart; only call this when the table is shutting down"""
+        self._merge_poller_stop.set()
+        poller = self._merge_poller
+        if poller is not None and poller.is_alive():
+            poller.join(timeout=5)
+
+    def _preallocate_pagerange(self, pagerange_index):
+        new_pagerange_path = f"{self.path}/pagerange_{pagerange_index}"
+        os.makedirs(f"{new_pagerange_path}/base", exist_ok=True)
+        os.makedirs(f"{new_pagerange_path}/tail", exist_ok=True)
+        self._preallocated_pagerange = pagerange_index
+
+    def preallocate_next_pagerange(self, pagerange_index):
+        """Create the next pagerange's directories off the insert path, so
+        crossing the boundary never pays makedirs syscall latency"""
+        if self._preallocated_pagerange >= pagerange_index:
+            return
+        if self._prealloc_thread is None or not self._prealloc_thread.is_alive():
+            self._prealloc_thread = threading.Thread(
+                target=self._preallocate_pagerange, args=(pagerange_index,), daemon=True)
+            self._prealloc_thread.start()
+
+    def path_indices(self, path):
+        """(pagerange_index, page_index) for a page path, parsed once per path"""
+        cached = self._path_indices.get(path)
+        if cached is None:
+            # Bounded rsplit only scans the path's tail instead of
+            # re-walking the db-root prefix
+            head, _, page_name = path.rsplit('/', 2)
+            pagerange_index = int(head.rsplit("pagerange_", 1)[1])
+            page_index = int(page_name.rsplit("page_", 1)[1].split(".")[0])
+            cached = (pagerange_index, page_index)
+            self._path_indices[path] = cached
+        return cached
+
+
 
     def merge(self, pagerange_index):
         # Start the merge process in a new thread
@@ -130,10 +238,10 @@ class Table:
                     new_tail_records = self.bufferpool.get_page(tail_path).read_all()
                     self.bufferpool.unpin_page(tail_path)
                     if first_update == False: # set new tps to the last rid in the tail page
-                        last_tps_temp = int(new_tail_records[-1].rid[1:])
+                        last_tps_temp = rid_seq(new_tail_records[-1].rid)
                         first_update = True
                     for record in reversed(new_tail_records):
-                        if int(record.rid[1:]) <= last_tps:
+                        if rid_seq(record.rid) <= last_tps:
                             reached_last_tps = True
                             break
                         #if you find previous update skip
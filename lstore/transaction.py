@@ -1,10 +1,19 @@
 import threading
-from collections import OrderedDict
+from itertools import count
 from lstore.index import Index
 from lstore.table import Table, Record
 from lstore.two_phase_lock import TwoPhaseLock, LockMode, LockGranularity
+from lstore.query import Query
 import time
 
+# Queries that accept a pre-located rid, so run() can hand down the rid
+# it already looked up for locking instead of the query re-probing
+_RID_AWARE = frozenset(("select", "update", "update_single", "delete"))
+
+# Query kinds, assigned once at add_query time so dispatch compares ints
+# instead of re-scanning query.__name__ per iteration
+QUERY_READ, QUERY_INSERT, QUERY_UPDATE = 0, 1, 2
+
 class Transaction:
     """
     Unit of Concurrency Controlled Database Operations
@@ -31,16 +40,66 @@ class Transaction:
     """
 
     # Class-level variables for transaction management
-    transaction_id_counter = 0                   # counts transaction ids
-    transaction_id_lock = threading.Lock()       # Ensures unique transaction IDs
+    _id_gen = count()                            # Transaction ids; C-level next() is atomic under the GIL
+    _prefix_cache = {}                           # {page id: (table id, pagerange id, page id)} shared prefixes
+    _pool = threading.local()                    # Per-thread free list of recycled instances
+    _POOL_MAX = 64                               # Bound the free list so idle threads don't hoard objects
+    _occ_latch = threading.Lock()                # Serializes optimistic validate+write phases
     global_lock_manager = None                   # Static/Shared 2PL for all transactions
     global_lock_manager_lock = threading.Lock()  # Thread-safe lock manager initialization
 
+    @classmethod
+    def acquire(cls, optimistic=False):
+        """
+        Returns a reset Transaction from the calling thread's pool, or a
+        fresh one. Pool-issued instances recycle themselves on
+        commit/abort, skipping the per-transaction list allocations -
+        use this for short-lived retry copies rather than transactions
+        the caller keeps referencing afterwards.
+        """
+        free = getattr(cls._pool, 'free', None)
+        if free:
+            txn = free.pop()
+            txn._reset(optimistic)
+            return txn
+        txn = cls(optimistic)
+        txn._pooled = True
+        return txn
+
+
+    def _reset(self, optimistic=False):
+        """Reinitializes a recycled instance for a new logical transaction"""
+        self.queries.clear()
+        self.changes.clear()
+        self.held_locks.clear()
+        self.read_set.clear()
+        self.optimistic = optimistic
+        self._has_writer = False
+        self.transaction_id = next(Transaction._id_gen)
+        self.start_ts = time.monotonic_ns()
+
+
+    def _recycle(self):
+        """Returns a pool-issued instance to the thread's free list"""
+        if not self._pooled:
+            return
+        free = getattr(Transaction._pool, 'free', None)
+        if free is None:
+            free = Transaction._pool.free = []
+        if len(free) < Transaction._POOL_MAX:
+            free.append(self)
+
+
     @classmethod
     def get_lock_manager(cls):
         """
-        Returns (or creates) the global lock manager shared by all transactions.
+        Returns (or creates) the global lock manager shared by all
+        transactions. Double-checked: after first initialization the fast
+        path is a single attribute load, no mutex.
         """
+        manager = cls.global_lock_manager
+        if manager is not None:
+            return manager
         with cls.global_lock_manager_lock:
             if cls.global_lock_manager is None:
                 #print("\nCreating lock manager")
@@ -48,36 +107,55 @@ class Transaction:
             return cls.global_lock_manager
 
 
-    def __init__(self):
+    def __init__(self, optimistic=False):
         """
         Initializes a new transaction with:
         - Unique transaction ID
         - Empty query list
         - Reference to global lock manager
         - Ordered tracking of acquired locks
+
+        With optimistic=True the transaction skips 2PL entirely: reads run
+        lock-free while recording base-record versions, and commit
+        validates the read set and applies writes under a short global
+        latch, retrying (via the worker) on conflict. Best for
+        low-contention workloads; all transactions on a table should use
+        the same mode.
         """
-        self.queries = []  # List of (query_function, table, args) tuples
+        self.queries = []  # List of (query_function, table, args, kind) tuples
         self.changes = []  # Track changes for rollback: (table, rid, is_insert)
-
-        # Track locks in order of acquisition with their granularity and mode
-        self.held_locks = OrderedDict()  # {item_id: (granularity, mode)}
-        # Get unique transaction ID thread-safely
-        with Transaction.transaction_id_lock:
-            self.transaction_id = Transaction.transaction_id_counter
-            Transaction.transaction_id_counter += 1
+        self.optimistic = optimistic
+        self.read_set = []  # (table, base_rid, version) seen by lock-free reads
+        self._pooled = False  # Only acquire()-issued instances are recycled
+        self._has_writer = False  # Set by add_query; decides exclusive mode without rescanning
+
+        # Track locks in order of acquisition. Just the item IDs: the
+        # granularity is derivable from the tuple's length and the mode
+        # from the transaction's overall lock mode
+        self.held_locks = []  # [item_id, ...]
+        # Unique transaction ID without a mutex round-trip; ids are
+        # monotonic, so they double as the start-order tie-breaker
+        self.transaction_id = next(Transaction._id_gen)
+        self.start_ts = time.monotonic_ns()
         #print(f"\nCreated Transaction T{self.transaction_id}")
         self.lock_manager = Transaction.get_lock_manager()
+        # Pre-bound methods skip an attribute lookup per call in the hot loop
+        self._acquire_lock = self.lock_manager.acquire_lock
+        self._acquire_locks = self.lock_manager.acquire_locks
 
 
     def _get_lock_ids(self, table, rid):
         """
         Generates hierarchical lock IDs for different granularity levels.
 
-        Lock ID Format:
-        - Table: "table_name"
-        - Page Range: "table_name/pagerange_X"
-        - Page: "table_name/pagerange_X/[base|tail]/page_Y"
-        - Record: "table_name/pagerange_X/[base|tail]/page_Y/rid"
+        Lock ID Format (tuples of small ints; parents are prefixes):
+        - Table: (table_id,)
+        - Page Range: (table_id, pagerange)
+        - Page: (table_id, pagerange, is_tail, page)
+        - Record: (table_id, pagerange, is_tail, page, offset)
+
+        Int tuples hash far cheaper than the old slash-joined path strings
+        and shrink the held-lock bookkeeping.
 
         Args:
             table: Table object to lock
@@ -86,28 +164,30 @@ class Transaction:
         Returns:
             Tuple of (table_lock_id, page_range_id, page_lock_id, record_lock_id)
         """
-        table_name = getattr(table, 'name', str(id(table)))
-        page_path = table.page_directory[rid][0]
-        record_offset = table.page_directory[rid][1]
+        # A record's directory entry never moves (merges rewrite in place),
+        # so the derived IDs are stable and memoized on the table itself -
+        # the memo's lifetime then matches the table's
+        cached = table._lock_id_cache.get(rid)
+        if cached is not None:
+            return cached
 
-        # Split path into components (e.g., [".", database, _tables, tablename, pagerange_0", "base", "page_1"])
-        parts = page_path.split('/')
-        #print("parts: ",  parts)
+        page_path, record_offset = table.page_directory[rid]
+        pagerange_index, page_index = table.path_indices(page_path)
+        is_tail = 1 if '/tail/' in page_path else 0
 
-        #ecs165/_tables/tablename/pagegrange/base/page
-        # Extract page range number from path (e.g., "pagerange_0" -> "0")
-        page_range = parts[4]
-        # Get page type (base or tail) and page number
-        page_type = parts[5]  # "base" or "tail"
-        page_num = parts[6]   # "page_X"
+        record_lock_id = (table.lock_table_id, pagerange_index, is_tail, page_index, record_offset)
 
-        # Generate lock IDs for each granularity level
-        table_lock_id = f"{table_name}"
-        page_range_id = f"{table_name}/{page_range}"
-        page_lock_id = f"{table_name}/{page_range}/{page_type}/{page_num}"
-        record_lock_id = f"{table_name}/{page_range}/{page_type}/{page_num}/{record_offset}"
+        # Records on one page share their ancestor IDs; interning the
+        # prefix tuples means one allocation per page instead of per record
+        page_key = record_lock_id[:4]
+        prefixes = Transaction._prefix_cache.get(page_key)
+        if prefixes is None:
+            prefixes = (page_key[:1], page_key[:2], page_key)
+            Transaction._prefix_cache[page_key] = prefixes
 
-        return table_lock_id, page_range_id, page_lock_id, record_lock_id
+        lock_ids = (prefixes[0], prefixes[1], prefixes[2], record_lock_id)
+        table._lock_id_cache[rid] = lock_ids
+        return lock_ids
 
 
     def add_query(self, query, table, *args):
@@ -120,7 +200,16 @@ class Transaction:
             *args: Arguments for the query function
         """
         #print(f"\nT{self.transaction_id} adding query: {query.__name__}")
-        self.queries.append((query, table, args))
+        name = query.__name__
+        if "insert" in name:
+            kind = QUERY_INSERT
+        elif "update" in name:
+            kind = QUERY_UPDATE
+        else:
+            kind = QUERY_READ
+        if kind != QUERY_READ:
+            self._has_writer = True
+        self.queries.append((query, table, args, kind))
 
 
     def run(self):
@@ -128,49 +217,96 @@ class Transaction:
         Executes all queries in the transaction while maintaining isolation.
         Returns True if all operations succeed, False otherwise.
         """
-        time.sleep(0.0000001) # For synchronization
-        # If any query in this transaction is an insert or update, force exclusive locks
-        overall_exclusive = any("update" in q.__name__ or "insert" in q.__name__ for q, table, args in self.queries)
+        if self.optimistic:
+            return self._run_optimistic()
+
+        # Fast path: a lone read needs no rollback bookkeeping and no lock
+        # hierarchy - writers are excluded by the record lock's parent check
+        queries = self.queries
+        if len(queries) == 1 and queries[0][3] == QUERY_READ:
+            return self._run_single_read()
+
+        # If any query in this transaction is an insert or update, force
+        # exclusive locks; maintained incrementally by add_query
+        overall_exclusive = self._has_writer
+
+        # When every query addresses a record by primary key, the whole
+        # lock set is known up front: acquire it in canonical (sorted)
+        # order so conflicting transactions collide at their first common
+        # lock, then execute in program order - reordering execution
+        # would make a query blind to the transaction's own earlier
+        # writes on other keys
+        lock_plan = None
+        if len(queries) > 1 and all(kind != QUERY_INSERT for _, _, _, kind in queries):
+            lock_plan = self._locate_lock_plan()
+
+        last_touch = {}
+        if lock_plan is not None:
+            if not self._acquire_planned_locks(lock_plan, overall_exclusive):
+                return self.abort()
+            # Last query under each table / pagerange, for early release
+            for i, (_, lock_ids) in enumerate(lock_plan):
+                last_touch[lock_ids[0]] = i
+                last_touch[lock_ids[1]] = i
 
         try:
-            for query, table, args in self.queries:
+            for qi, (query, table, args, kind) in enumerate(queries):
                 #print(f"\nT{self.transaction_id} executing {query.__name__} with args: {args}")
-                # Decide lock_mode: if overall_exclusive is True then use EXCLUSIVE for every operation
-                if overall_exclusive or ("update" in query.__name__ or "insert" in query.__name__):
+                if lock_plan is not None:
+                    rid = lock_plan[qi][0]
+                elif kind == QUERY_INSERT:
+                    # Decide lock_mode: if overall_exclusive is True then use EXCLUSIVE for every operation
                     lock_mode = LockMode.EXCLUSIVE
-                else:
-                    lock_mode = LockMode.SHARED
-
-                if "insert" in query.__name__:
                     if not self._acquire_insert_locks(table, lock_mode):
                         #print(f"T{self.transaction_id} failed to acquire locks for insert")
                         return self.abort()
                 else:
+                    if overall_exclusive or kind != QUERY_READ:
+                        lock_mode = LockMode.EXCLUSIVE
+                    else:
+                        lock_mode = LockMode.SHARED
                     rid = table.index.locate(0, args[0])
-                    if not rid:
+                    if rid is False:
                         #print(f"T{self.transaction_id} could not locate record with key {args[0]}")
                         return self.abort()
                     if not self._acquire_operation_locks(table, rid, lock_mode):
                         #print(f"T{self.transaction_id} failed to acquire operation locks")
                         return self.abort()
 
-                # Execute the query
-                result = query(*args)
+                # Execute the query, reusing the rid located for locking
+                # where the query can take it
+                if kind == QUERY_INSERT or query.__name__ not in _RID_AWARE:
+                    result = query(*args)
+                else:
+                    result = query(*args, _rid=rid)
 
                 # Handle query result
                 if result is False:
-                    if "insert" in query.__name__:
+                    if kind == QUERY_INSERT:
                         return self.abort(dupe_error=True)
                     return self.abort()
 
                 # Track successful operations for potential rollback
-                if "insert" in query.__name__:
+                if kind == QUERY_INSERT:
                     #print(f"T{self.transaction_id} successfully inserted record with key {args[0]}")
                     self.changes.append((table, args[0], True))
-                elif "update" in query.__name__:
+                elif kind == QUERY_UPDATE:
                     #print(f"T{self.transaction_id} successfully updated record with key {args[0]}")
                     self.changes.append((table, args[0], False))
 
+                # Bamboo-style early release: past the last query under a
+                # pagerange or table, drop that non-leaf lock so waiters
+                # stop queueing behind it. The record/page locks still held
+                # protect everything this transaction wrote.
+                if lock_plan is not None:
+                    table_id, page_range_id = lock_plan[qi][1][0], lock_plan[qi][1][1]
+                    if last_touch[page_range_id] == qi:
+                        self.lock_manager.release_lock_early(
+                            self.transaction_id, page_range_id, LockGranularity.PAGE_RANGE)
+                    if last_touch[table_id] == qi:
+                        self.lock_manager.release_lock_early(
+                            self.transaction_id, table_id, LockGranularity.TABLE)
+
             #print(f"T{self.transaction_id} all queries successful")
             return self.commit(), None
 
@@ -181,6 +317,143 @@ class Transaction:
             return self.abort()
 
 
+    def _locate_lock_plan(self):
+        """
+        Resolves (rid, lock_ids) for every query, in program order.
+        Only valid when each query addresses one record by primary key -
+        select on the key column, update/update_single, delete. Aggregates
+        and secondary-column selects make the plan unknowable, and a key
+        that does not locate means run() will abort anyway; both return
+        None so run() falls back to per-query locking.
+        """
+        plan = []
+        for query, table, args, _ in self.queries:
+            name = query.__name__
+            if name == "select":
+                if args[1] != 0:
+                    return None
+            elif name not in ("update", "update_single", "delete"):
+                return None
+            rid = table.index.locate(0, args[0])
+            if rid is False:
+                return None
+            plan.append((rid, self._get_lock_ids(table, rid)))
+        return plan
+
+
+    def _acquire_planned_locks(self, lock_plan, overall_exclusive):
+        """
+        Acquires the plan's whole lock set in one batch, sorted by record
+        lock ID so every transaction approaches shared records from the
+        same direction. Execution order is unaffected.
+        """
+        if overall_exclusive:
+            lock_mode, table_mode = LockMode.EXCLUSIVE, LockMode.INTENTION_EXCLUSIVE
+        else:
+            lock_mode, table_mode = LockMode.SHARED, LockMode.INTENTION_SHARED
+
+        to_acquire = []
+        seen = set()
+        for _, lock_ids in sorted(lock_plan, key=lambda pair: pair[1][3]):
+            table_id, page_range_id, page_id, record_id = lock_ids
+            for item_id, granularity, mode in (
+                    (table_id, LockGranularity.TABLE, table_mode),
+                    (page_range_id, LockGranularity.PAGE_RANGE, lock_mode),
+                    (page_id, LockGranularity.PAGE, lock_mode),
+                    (record_id, LockGranularity.RECORD, lock_mode)):
+                if item_id not in seen:
+                    seen.add(item_id)
+                    to_acquire.append((item_id, granularity, mode))
+
+        acquired = self._acquire_locks(self.transaction_id, to_acquire)
+        if acquired is False:
+            return False
+        self.held_locks.extend(item_id for item_id, _, _ in acquired)
+        return True
+
+
+    @staticmethod
+    def _base_version(table, rid):
+        """A base record's indirection pointer doubles as its version: it
+        moves to a fresh tail rid on every update and delete"""
+        path, offset = table.page_directory[rid]
+        with table.bufferpool.pinned(path) as page:
+            return page.read_index(offset).indirection
+
+
+    def _run_optimistic(self):
+        """
+        OCC execution: lock-free read phase, then validation and writes
+        under a short global latch. Conflicting transactions are caught by
+        a version change in the read set and aborted for the worker to
+        retry.
+        """
+        try:
+            writes = []
+            for query, table, args, kind in self.queries:
+                if kind == QUERY_READ:
+                    rid = table.index.locate(0, args[0])
+                    if rid is False:
+                        return self.abort()
+                    self.read_set.append((table, rid, self._base_version(table, rid)))
+                    if query(*args) is False:
+                        return self.abort()
+                else:
+                    # Writes are deferred to the latched phase so a failed
+                    # validation never has anything to undo
+                    writes.append((query, table, args, kind))
+
+            with Transaction._occ_latch:
+                for table, rid, version in self.read_set:
+                    if self._base_version(table, rid) != version:
+                        return self.abort()
+
+                for query, table, args, kind in writes:
+                    if query(*args) is False:
+                        return self.abort(dupe_error=(kind == QUERY_INSERT))
+                    self.changes.append((table, args[0], kind == QUERY_INSERT))
+
+            return self.commit(), None
+
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            return self.abort()
+
+
+    def _run_single_read(self):
+        """
+        Executes a single-read transaction with one SHARED record lock.
+        Conflicting writers hold EXCLUSIVE locks on the record or its
+        ancestors, which the lock manager's parent check already rejects,
+        so the table/pagerange/page locks can be skipped entirely.
+        """
+        query, table, args, _ = self.queries[0]
+        try:
+            rid = table.index.locate(0, args[0])
+            if rid is False:
+                return False, None
+
+            record_id = self._get_lock_ids(table, rid)[3]
+            if not self._acquire_lock(
+                    self.transaction_id, record_id, LockMode.SHARED, LockGranularity.RECORD):
+                return False, None
+            try:
+                if query.__name__ in _RID_AWARE:
+                    result = query(*args, _rid=rid)
+                else:
+                    result = query(*args)
+            finally:
+                self.lock_manager.release_all(self.transaction_id)
+            if result is False:
+                return False, None
+            return True, None
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            return False, None
+
+
     def _acquire_insert_locks(self, table, lock_mode):
         """
         Helper method to acquire locks for insert operations
@@ -188,16 +461,16 @@ class Transaction:
         """
         #print(f"T{self.transaction_id} requesting table lock for INSERT")
         # Acquire table lock from lock manager
-        if not self.lock_manager.acquire_lock(
+        table_lock_id = (table.lock_table_id,)
+        if not self._acquire_lock(
                 self.transaction_id,
-                table.name,
+                table_lock_id,
                 lock_mode,
                 LockGranularity.TABLE
         ):
             # print(f"T{self.transaction_id} failed to acquire table lock")
             return False
-        # {item_id: (granularity, mode)}
-        self.held_locks[table.name] = (LockGranularity.TABLE, lock_mode)
+        self.held_locks.append(table_lock_id)
         return True
 
 
@@ -207,22 +480,28 @@ class Transaction:
         #print(f"T{self.transaction_id} requesting locks for operation")
         #print(f"Lock IDs: table={table_id}, page_range={page_range_id}, page={page_id}, record={record_id}")
 
-        # Define lock hierarchy
+        # Define lock hierarchy; one batch call takes the manager's mutex
+        # once instead of four times. The table lock is taken in intention
+        # mode so writers to different page ranges don't serialize at the
+        # table. The page range keeps the real S/X - tail-page allocation
+        # and the merge bookkeeping are per-pagerange and unsynchronized,
+        # so same-pagerange writers must still exclude each other.
+        if lock_mode == LockMode.SHARED:
+            table_mode = LockMode.INTENTION_SHARED
+        else:
+            table_mode = LockMode.INTENTION_EXCLUSIVE
         locks_to_acquire = [
-            (table_id, LockGranularity.TABLE),
-            (page_range_id, LockGranularity.PAGE_RANGE),
-            (page_id, LockGranularity.PAGE),
-            (record_id, LockGranularity.RECORD)
+            (table_id, LockGranularity.TABLE, table_mode),
+            (page_range_id, LockGranularity.PAGE_RANGE, lock_mode),
+            (page_id, LockGranularity.PAGE, lock_mode),
+            (record_id, LockGranularity.RECORD, lock_mode)
         ]
 
-        # Acquire locks in hierarchical order
-        for item_id, granularity in locks_to_acquire:
-            if not self.lock_manager.acquire_lock(
-                    self.transaction_id, item_id, lock_mode, granularity
-            ):
-                #print(f"T{self.transaction_id} failed to acquire {granularity} lock")
-                return False
-            self.held_locks[item_id] = (granularity, lock_mode)
+        acquired = self._acquire_locks(self.transaction_id, locks_to_acquire)
+        if acquired is False:
+            #print(f"T{self.transaction_id} failed to acquire operation locks")
+            return False
+        self.held_locks.extend(item_id for item_id, _, _ in acquired)
 
         return True
 
@@ -236,12 +515,14 @@ class Transaction:
         try:
             # Rollback changes in reverse order
             #print(f"Rolling back changes for T{self.transaction_id}")
+            queries_by_table = {}  # One Query per table across the rollback
             for table, key, is_insert in reversed(self.changes):
                 try:
                     #print(f"Rolling back {'insert' if is_insert else 'update'} for key {key}")
                     # For inserts, delete the record
-                    from lstore.query import Query
-                    query = Query(table)
+                    query = queries_by_table.get(id(table))
+                    if query is None:
+                        query = queries_by_table.setdefault(id(table), Query(table))
                     if not query.delete(key):
                         pass
                         #print(f"Warning: Failed to rollback insert for key {key}")
@@ -252,12 +533,12 @@ class Transaction:
             # Always release locks, even if rollback fails
             if self.lock_manager:
                 #print(f"Releasing locks for T{self.transaction_id}")
-                for item_id in reversed(self.held_locks):
-                    self.lock_manager.release_lock(self.transaction_id, item_id)
+                self.lock_manager.release_all(self.transaction_id)
                 self.held_locks.clear()
 
         #print(f"T{self.transaction_id} abort complete")
-        
+        self._recycle()
+
         return False, "dupe_error" if dupe_error else None
 
 
@@ -275,9 +556,9 @@ class Transaction:
         # Release all locks in reverse order of acquisition
         # This automatically handles granularity order since we acquired in correct order
         if self.lock_manager:
-            for item_id in reversed(self.held_locks):
-                self.lock_manager.release_lock(self.transaction_id, item_id)
+            self.lock_manager.release_all(self.transaction_id)
             self.held_locks.clear()
 
         #print(f"T{self.transaction_id} commit complete")
+        self._recycle()
         return True
@@ -1,4 +1,5 @@
 import threading
+import time
 from lstore.index import Index
 from lstore.table import Table, Record
 from lstore.transaction import Transaction
@@ -101,11 +102,20 @@ class TransactionWorker:
                     if dupe == "dupe_error":
                         #print("dupe_error, skipping transaction...")
                         break
+
+                    # Back off before retrying so a no-wait abort storm can't
+                    # burn the retry budget while the conflicting transaction
+                    # is still running
+                    time.sleep(0.0001 * min(i, 10))
                     
-                    # Create a fresh copy of the transaction
-                    fresh_txn = Transaction()
+                    # Create a fresh copy of the transaction (pooled - the
+                    # copy is dropped as soon as it finishes), keeping the
+                    # original's concurrency scheme: an optimistic retry
+                    # must not fall back to 2PL while its peers run
+                    # validation-based
+                    fresh_txn = Transaction.acquire(transaction.optimistic)
                     # Copy all queries from the original transaction
-                    for query, table, args in transaction.queries:
+                    for query, table, args, _ in transaction.queries:
                         fresh_txn.add_query(query, table, *args)
                     
                     # Run the fresh transaction instead
@@ -5,12 +5,17 @@ class LockMode:
     """
     - SHARED (0): Multiple transactions can read the same data
     - EXCLUSIVE (1): Only one transaction can write to the data
+    - INTENTION_SHARED (2): Transaction reads somewhere below this item
+    - INTENTION_EXCLUSIVE (3): Transaction writes somewhere below this item
+
+    Intention modes are taken on ancestors so that e.g. two writers to
+    different page ranges of one table no longer conflict at the table.
     """
-    SHARED, EXCLUSIVE = 0, 1  # Fixing the usage of enumerate
+    SHARED, EXCLUSIVE, INTENTION_SHARED, INTENTION_EXCLUSIVE = 0, 1, 2, 3
 
     @staticmethod
     def to_string(mode):
-        return "SHARED" if mode == LockMode.SHARED else "EXCLUSIVE"
+        return ("SHARED", "EXCLUSIVE", "INTENTION_SHARED", "INTENTION_EXCLUSIVE")[mode]
 
 
 class LockGranularity:
@@ -42,8 +47,9 @@ class _Transaction:
     1. Growing Phase: Transaction can acquire locks but cannot release any
     2. Shrinking Phase: Transaction can release locks but cannot acquire new ones
     """
-    def __init__(self, transaction_id):
+    def __init__(self, transaction_id, acquire_seq):
         self.transaction_id = transaction_id
+        self.acquire_seq = acquire_seq  # First-contact order; deterministic tie-breaker
         self.shrinking_phase = False  # Once True, transaction cannot acquire new locks
 
 
@@ -68,44 +74,58 @@ class TwoPhaseLock:
     def __init__(self):
         self.mut = threading.Lock()  # Mutex for thread-safe lock operations
         self.transactions = {}       # Maps transaction_id to Transaction object
+        self._tx_locks = {}          # {tid: [(item_id, granularity)]} reverse index for release_all
+        self._seq = 0                # Monotonic acquire sequence, bumped under self.mut
 
         # Format: {item_id: {"readers": set(), "writer": None}}
         self.table_locks = {}      # Locks on entire tables
         self.page_range_locks = {} # Locks on page ranges
         self.page_locks = {}       # Locks on specific pages
         self.record_locks = {}     # Locks on individual records
+        # Granularity values are 0..3, so dispatch is a tuple index
+        # instead of an if/elif chain
+        self._lock_dicts = (self.table_locks, self.page_range_locks,
+                            self.page_locks, self.record_locks)
 
 
     def _get_lock_dict(self, granularity: LockGranularity):
         """
         Returns the appropriate lock dictionary for the given granularity level.
         """
-        if granularity == LockGranularity.TABLE:
-            return self.table_locks
-        elif granularity == LockGranularity.PAGE_RANGE:
-            return self.page_range_locks
-        elif granularity == LockGranularity.PAGE:
-            return self.page_locks
-        else:  # RECORD
-            return self.record_locks
+        return self._lock_dicts[granularity]
 
 
-    def _has_lock(self, transaction_id: int, item_id: str, lock_dict: dict) -> bool:
+    def _has_lock(self, transaction_id: int, item_id, mode: LockMode, lock_dict: dict) -> bool:
         """
-        Checks if a transaction already holds any type of lock (shared or exclusive) on an item.
+        Checks whether a lock the transaction already holds on this item is
+        at least as strong as the requested mode. A held weaker mode (e.g.
+        IX when EXCLUSIVE is requested) returns False so the request goes
+        through _grant_lock as an upgrade attempt.
 
         Args:
             transaction_id: ID of transaction to check
             item_id: Resource identifier to check
+            mode: Mode being requested
             lock_dict: Dictionary containing lock information
 
         Returns:
-            True if transaction holds either type of lock, False otherwise
+            True if a held lock already covers the request, False otherwise
         """
-        if item_id not in lock_dict:
+        lock_info = lock_dict.get(item_id)
+        if lock_info is None:
             return False
-        lock_info = lock_dict[item_id]
-        return transaction_id in lock_info["readers"] or lock_info["writer"] == transaction_id
+        if lock_info["writer"] == transaction_id:
+            return True  # EXCLUSIVE covers every mode
+        if mode == LockMode.EXCLUSIVE:
+            return False
+        if mode == LockMode.SHARED:
+            return transaction_id in lock_info["readers"]
+        if mode == LockMode.INTENTION_EXCLUSIVE:
+            return transaction_id in lock_info["i_writers"]
+        # INTENTION_SHARED: any held mode covers it
+        return (transaction_id in lock_info["readers"] or
+                transaction_id in lock_info["i_readers"] or
+                transaction_id in lock_info["i_writers"])
 
 
     def _check_parent_locks(self, transaction_id: int, item_id: str, mode: LockMode, granularity: LockGranularity) -> bool:
@@ -114,39 +134,33 @@ class TwoPhaseLock:
 
         Args:
             transaction_id: ID of transaction requesting lock
-            item_id: Resource identifier (e.g., "table/page_1/rid_2")
+            item_id: Resource identifier tuple; parents are prefixes of it
             mode: Type of lock requested (SHARED/EXCLUSIVE)
             granularity: Level of lock requested (TABLE/PAGE_RANGE/PAGE/RECORD)
 
         Returns:
             True if no conflicts with parent locks, False otherwise
         """
-        # Split item_id into parts to check parent locks
-        parts = item_id.split('/')
         #print(f"\nChecking parent locks for T{transaction_id} requesting {LockMode.to_string(mode)} "
               #f"lock on {LockGranularity.to_string(granularity)} {item_id}")
 
-        # Build list of parent locks to check based on granularity
+        # Parent lock IDs are prefix slices of the item's tuple ID
         parent_locks = []
-        table_id = parts[0]
 
         # Build parent locks based on granularity level
         if granularity >= LockGranularity.RECORD:
-            page_id = f"{parts[0]}/{parts[1]}/{parts[2]}/{parts[3]}"
-            page_range_id = f"{parts[0]}/{parts[1]}"
             parent_locks = [
-                (table_id, self.table_locks),
-                (page_range_id, self.page_range_locks),
-                (page_id, self.page_locks)
+                (item_id[:1], self.table_locks),
+                (item_id[:2], self.page_range_locks),
+                (item_id[:4], self.page_locks)
             ]
         elif granularity == LockGranularity.PAGE:
-            page_range_id = f"{parts[0]}/{parts[1]}"
             parent_locks = [
-                (table_id, self.table_locks),
-                (page_range_id, self.page_range_locks)
+                (item_id[:1], self.table_locks),
+                (item_id[:2], self.page_range_locks)
             ]
         elif granularity == LockGranularity.PAGE_RANGE:
-            parent_locks = [(table_id, self.table_locks)]
+            parent_locks = [(item_id[:1], self.table_locks)]
 
         # Check each parent lock for conflicts
         for lock_id, lock_dict in parent_locks:
@@ -175,7 +189,7 @@ class TwoPhaseLock:
 
         Args:
             transaction_id: ID of transaction requesting lock
-            item_id: Resource identifier (e.g., "table/page_1/rid_2")
+            item_id: Resource identifier tuple (e.g., (table_id, pagerange, is_tail, page, offset))
             mode: Type of lock requested (SHARED/EXCLUSIVE)
             granularity: Level of lock requested (TABLE/PAGE/RECORD)
 
@@ -188,7 +202,8 @@ class TwoPhaseLock:
 
             # Create transaction object if not exists
             if transaction_id not in self.transactions:
-                self.transactions[transaction_id] = _Transaction(transaction_id)
+                self.transactions[transaction_id] = _Transaction(transaction_id, self._seq)
+                self._seq += 1
 
             transaction = self.transactions[transaction_id]
 
@@ -200,46 +215,202 @@ class TwoPhaseLock:
             # Get appropriate lock dictionary for this granularity
             lock_dict = self._get_lock_dict(granularity)
 
-            # Check if transaction already has this lock
-            if self._has_lock(transaction_id, item_id, lock_dict):
+            # Check if a lock already held covers the request; a held
+            # weaker mode falls through to _grant_lock as an upgrade
+            if self._has_lock(transaction_id, item_id, mode, lock_dict):
                 #print(f"T{transaction_id} already has lock on {item_id}")
                 return True
 
-            # Check if parent locks conflict (hierarchical locking)
-            if not self._check_parent_locks(transaction_id, item_id, mode, granularity):
-                return False
+            return self._grant_lock(transaction_id, item_id, mode, granularity, lock_dict)
 
-            # Initialize lock info if this is first lock on item
-            if item_id not in lock_dict:
-                lock_dict[item_id] = {"readers": set(), "writer": None}
-
-            lock_info = lock_dict[item_id]
-
-            # #print current lock state for debugging
-            #print(f"Current lock state for {item_id}:")
-            #print(f"  - Readers: {', '.join('T' + str(r) for r in lock_info['readers']) if lock_info['readers'] else 'None'}")
-            writer_id = lock_info['writer']
-            #print(f"  - Writer: {'T' + str(writer_id) if writer_id is not None else 'None'}")
-
-            # Handle shared lock request
-            if mode == LockMode.SHARED:
-                if lock_info["writer"] is None or lock_info["writer"] == transaction_id:
-                    lock_info["readers"].add(transaction_id)
-                    #print(f"GRANTED: T{transaction_id} acquired SHARED lock")
-                    return True
-                #print(f"DENIED: Item is exclusively locked by T{lock_info['writer']}")
-
-            # Handle exclusive lock request
-            else:  # EXCLUSIVE
-                if (not lock_info["readers"] or lock_info["readers"] == {transaction_id}) and \
-                        (lock_info["writer"] is None or lock_info["writer"] == transaction_id):
-                    lock_info["writer"] = transaction_id
-                    #print(f"GRANTED: T{transaction_id} acquired EXCLUSIVE lock")
-                    return True
-                #print(f"DENIED: Conflicting readers {lock_info['readers']} or writer T{lock_info['writer']}")
 
+    def _grant_lock(self, transaction_id, item_id, mode, granularity, lock_dict):
+        """
+        Attempts to grant a lock the transaction does not yet hold in a
+        covering mode. Caller holds self.mut and has already checked
+        _has_lock. A transaction holding a weaker mode lands here as an
+        upgrade: the no_other_* checks below exclude the requester, so
+        the upgrade succeeds exactly when no other holder is present,
+        mirroring the single-reader S->X rule.
+        """
+        # Check if parent locks conflict (hierarchical locking)
+        if not self._check_parent_locks(transaction_id, item_id, mode, granularity):
             return False
 
+        # Initialize lock info if this is first lock on item
+        if item_id not in lock_dict:
+            lock_dict[item_id] = {"readers": set(), "writer": None,
+                                  "i_readers": set(), "i_writers": set()}
+
+        lock_info = lock_dict[item_id]
+        writer = lock_info["writer"]
+        readers = lock_info["readers"]
+        i_readers = lock_info["i_readers"]
+        i_writers = lock_info["i_writers"]
+        # Captured before granting so an upgrade does not re-enter the
+        # reverse index (release would then double-remove the item)
+        already_holder = (writer == transaction_id or
+                          transaction_id in readers or
+                          transaction_id in i_readers or
+                          transaction_id in i_writers)
+        # Length/membership checks instead of set differences: these run
+        # inside the manager's mutex, so no allocations here
+        no_other_writer = writer is None or writer == transaction_id
+        no_other_readers = not readers or (len(readers) == 1 and transaction_id in readers)
+        no_other_i_writers = not i_writers or (len(i_writers) == 1 and transaction_id in i_writers)
+        no_other_i_readers = not i_readers or (len(i_readers) == 1 and transaction_id in i_readers)
+
+        # Standard multi-granularity compatibility: IS conflicts only with
+        # X; IX with S and X; S with IX and X; X with everything
+        granted = False
+        if mode == LockMode.INTENTION_SHARED:
+            if no_other_writer:
+                i_readers.add(transaction_id)
+                granted = True
+
+        elif mode == LockMode.INTENTION_EXCLUSIVE:
+            if no_other_writer and no_other_readers:
+                i_writers.add(transaction_id)
+                granted = True
+
+        elif mode == LockMode.SHARED:
+            if no_other_writer and no_other_i_writers:
+                readers.add(transaction_id)
+                #print(f"GRANTED: T{transaction_id} acquired SHARED lock")
+                granted = True
+            #print(f"DENIED: Item is exclusively locked by T{lock_info['writer']}")
+
+        else:  # EXCLUSIVE
+            if no_other_writer and no_other_readers and no_other_i_writers and no_other_i_readers:
+                lock_info["writer"] = transaction_id
+                # Upgrade: absorb any weaker holds into the writer slot
+                readers.discard(transaction_id)
+                i_readers.discard(transaction_id)
+                i_writers.discard(transaction_id)
+                #print(f"GRANTED: T{transaction_id} acquired EXCLUSIVE lock")
+                granted = True
+            #print(f"DENIED: Conflicting readers {lock_info['readers']} or writer T{lock_info['writer']}")
+
+        if granted and not already_holder:
+            # Reverse index lets release_all find this transaction's locks
+            # without scanning every lock dict
+            self._tx_locks.setdefault(transaction_id, []).append((item_id, granularity))
+        return granted
+
+
+    def acquire_locks(self, transaction_id: int, items) -> "list | bool":
+        """
+        Acquires a batch of locks under a single mutex hold.
+
+        Args:
+            transaction_id: ID of transaction requesting locks
+            items: List of (item_id, granularity, mode) in hierarchical order
+
+        Returns:
+            List of the (item_id, granularity, mode) entries newly granted
+            (already-held entries are skipped), or False if any lock was
+            denied - in which case the partial grants are rolled back.
+        """
+        with self.mut:
+            if transaction_id not in self.transactions:
+                self.transactions[transaction_id] = _Transaction(transaction_id, self._seq)
+                self._seq += 1
+
+            transaction = self.transactions[transaction_id]
+            if transaction.shrinking_phase:
+                return False
+
+            # Hot loop: bind the dispatch table and helpers once
+            lock_dicts = self._lock_dicts
+            has_lock = self._has_lock
+            grant_lock = self._grant_lock
+
+            # Upgrades granted in this batch never touch the reverse
+            # index, so rollback must work from the tx_locks suffix
+            # appended since batch start, not from a per-grant pop
+            tx_locks = self._tx_locks.setdefault(transaction_id, [])
+            batch_start = len(tx_locks)
+
+            acquired = []
+            upgrades = []  # (item_id, lock_dict, was_reader, was_i_reader, was_i_writer)
+            for item_id, granularity, mode in items:
+                lock_dict = lock_dicts[granularity]
+                if has_lock(transaction_id, item_id, mode, lock_dict):
+                    continue
+                # Snapshot any weaker hold so a denied batch can restore
+                # it - an upgrade's grant absorbs the prior membership
+                lock_info = lock_dict.get(item_id)
+                prior = None
+                if lock_info is not None and lock_info["writer"] != transaction_id:
+                    was_reader = transaction_id in lock_info["readers"]
+                    was_i_reader = transaction_id in lock_info["i_readers"]
+                    was_i_writer = transaction_id in lock_info["i_writers"]
+                    if was_reader or was_i_reader or was_i_writer:
+                        prior = (was_reader, was_i_reader, was_i_writer)
+                if grant_lock(transaction_id, item_id, mode, granularity, lock_dict):
+                    acquired.append((item_id, granularity, mode))
+                    if prior is not None:
+                        upgrades.append((item_id, lock_dict) + prior)
+                    continue
+                # Denied: undo only this batch. Upgrades revert to their
+                # pre-upgrade holder state, then the fresh grants recorded
+                # since batch_start are removed outright
+                for up_item_id, up_dict, was_reader, was_i_reader, was_i_writer in upgrades:
+                    up_info = up_dict[up_item_id]
+                    if up_info["writer"] == transaction_id:
+                        up_info["writer"] = None
+                    if was_reader:
+                        up_info["readers"].add(transaction_id)
+                    if was_i_reader:
+                        up_info["i_readers"].add(transaction_id)
+                    if was_i_writer:
+                        up_info["i_writers"].add(transaction_id)
+                for rb_item_id, rb_granularity in tx_locks[batch_start:]:
+                    self._remove_holder(transaction_id, rb_item_id, lock_dicts[rb_granularity])
+                del tx_locks[batch_start:]
+                return False
+            return acquired
+
+
+    def _remove_holder(self, transaction_id, item_id, lock_dict):
+        """Drops the transaction from an item's readers/writer. Caller holds self.mut"""
+        lock_info = lock_dict.get(item_id)
+        if lock_info is None:
+            return
+        lock_info["readers"].discard(transaction_id)
+        lock_info["i_readers"].discard(transaction_id)
+        lock_info["i_writers"].discard(transaction_id)
+        if lock_info["writer"] == transaction_id:
+            lock_info["writer"] = None
+
+
+    def release_lock_early(self, transaction_id: int, item_id, granularity: LockGranularity):
+        """
+        Releases a single lock without entering the shrinking phase
+        (Bamboo-style early release for non-leaf levels). Only safe when
+        the transaction will not touch anything under this item again -
+        the leaf locks it still holds keep protecting its own records.
+        """
+        with self.mut:
+            self._remove_holder(transaction_id, item_id, self._get_lock_dict(granularity))
+
+
+    def release_all(self, transaction_id: int):
+        """
+        Releases every lock a transaction holds in one mutex hold, using
+        the reverse index built at grant time, and drops the transaction's
+        manager-side state. This manager never blocks waiters (no-wait
+        policy), so there is no condition to notify.
+        """
+        with self.mut:
+            tx_locks = self._tx_locks.pop(transaction_id, None)
+            self.transactions.pop(transaction_id, None)
+            if not tx_locks:
+                return
+            lock_dicts = self._lock_dicts
+            for item_id, granularity in reversed(tx_locks):
+                self._remove_holder(transaction_id, item_id, lock_dicts[granularity])
+
 
     def release_lock(self, transaction_id: int, item_id: str):
         """
@@ -269,14 +440,4 @@ class TwoPhaseLock:
             for granularity in [LockGranularity.RECORD, LockGranularity.PAGE_RANGE,LockGranularity.PAGE, LockGranularity.TABLE]:
                 lock_dict = self._get_lock_dict(granularity)
                 if item_id in lock_dict:
-                    lock_info = lock_dict[item_id]
-
-                    # Release shared lock if held
-                    if transaction_id in lock_info["readers"]:
-                        lock_info["readers"].remove(transaction_id)
-                        #print(f"Released shared lock for T{transaction_id} on {LockGranularity.to_string(granularity)} {item_id}")
-
-                    # Release exclusive lock if held
-                    if lock_info["writer"] == transaction_id:
-                        lock_info["writer"] = None
-                        #print(f"Released exclusive lock for T{transaction_id} on {LockGranularity.to_string(granularity)} {item_id}")
+                    self._remove_holder(transaction_id, item_id, lock_dict)
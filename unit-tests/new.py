@@ -8,7 +8,8 @@ import unittest
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from lstore.db import Database
 from lstore.query import Query
-from lstore.transaction import Transaction
+from lstore.transaction import Transaction, QUERY_INSERT
+from lstore.table import make_base_rid, make_tail_rid
 from lstore.transaction_worker import TransactionWorker
 from lstore.two_phase_lock import TwoPhaseLock, LockMode, LockGranularity
 
@@ -53,7 +54,7 @@ class testingTransactions(unittest.TestCase):
         trans.add_query(self.query.insert, self.test_table, 3005, 2, 3, 4, 5)
         self.assertIsNotNone(trans.queries, msg="query failed to add")
         exQ = []
-        exQ.append((self.query.insert, self.test_table, (3005,2,3,4,5)))
+        exQ.append((self.query.insert, self.test_table, (3005,2,3,4,5), QUERY_INSERT))
         self.assertEqual(trans.queries, exQ, msg="query formatted incorrectly")
         
 
@@ -65,7 +66,7 @@ class testingTransactions(unittest.TestCase):
         def acquire_insert_locks(transaction):
             res = transaction._acquire_insert_locks(self.test_table, LockMode.EXCLUSIVE)
             if res:
-                self.assertEqual(transaction.held_locks[self.test_table.name], (LockGranularity.TABLE, LockMode.EXCLUSIVE), msg="lock not held correctly")
+                self.assertIn((self.test_table.lock_table_id,), transaction.held_locks, msg="lock not held correctly")
             try:
                 self.assertTrue(res, msg=f"lock not acquired for thread: {threading.current_thread().name}")
             except AssertionError as e:
@@ -91,15 +92,15 @@ class testingTransactions(unittest.TestCase):
 
         def acquire_operation_locks(transaction):
             #check if successful
-            res = transaction._acquire_operation_locks(self.test_table, 'b0', LockMode.EXCLUSIVE)
+            res = transaction._acquire_operation_locks(self.test_table, make_base_rid(0), LockMode.EXCLUSIVE)
             #get output ids and check if what is expected
-            table_id, page_range_id, page_id, record_id = transaction._get_lock_ids(self.test_table, 'b0')
+            table_id, page_range_id, page_id, record_id = transaction._get_lock_ids(self.test_table, make_base_rid(0))
             #only check if thread lock was acquired
             if res:
-                self.assertEqual(transaction.held_locks[table_id], (LockGranularity.TABLE, LockMode.EXCLUSIVE), msg="table lock not held correctly")
-                self.assertEqual(transaction.held_locks[page_range_id], (LockGranularity.PAGE_RANGE, LockMode.EXCLUSIVE), msg="page range lock not held correctly")
-                self.assertEqual(transaction.held_locks[page_id], (LockGranularity.PAGE, LockMode.EXCLUSIVE), msg="page lock not held correctly")
-                self.assertEqual(transaction.held_locks[record_id], (LockGranularity.RECORD, LockMode.EXCLUSIVE), msg="record lock not held correctly")
+                self.assertIn(table_id, transaction.held_locks, msg="table lock not held correctly")
+                self.assertIn(page_range_id, transaction.held_locks, msg="page range lock not held correctly")
+                self.assertIn(page_id, transaction.held_locks, msg="page lock not held correctly")
+                self.assertIn(record_id, transaction.held_locks, msg="record lock not held correctly")
                 #this'll fail if lock wasn't acquired
             self.assertTrue(res, msg=f"lock not acquired for thread: {threading.current_thread().name}")
 
@@ -117,11 +118,13 @@ class testingTransactions(unittest.TestCase):
 
     def test_RunGetIds(self):
         trans1 = Transaction()
-        print(f"what get_lock_ids returns: {trans1._get_lock_ids(self.test_table, 'b0')}")
-        self.assertEqual(trans1._get_lock_ids(self.test_table, 'b0'), ('test',
-                                                                       'test/pagerange_0',
-                                                                       'test/pagerange_0/base/page_0',
-                                                                       f"test/pagerange_0/base/page_0/{self.test_table.page_directory['b0'][1]}"),msg="if these tuples are different shows the differences")
+        print(f"what get_lock_ids returns: {trans1._get_lock_ids(self.test_table, make_base_rid(0))}")
+        tid = self.test_table.lock_table_id
+        offset = self.test_table.page_directory[make_base_rid(0)][1]
+        self.assertEqual(trans1._get_lock_ids(self.test_table, make_base_rid(0)), ((tid,),
+                                                                       (tid, 0),
+                                                                       (tid, 0, 0, 0),
+                                                                       (tid, 0, 0, 0, offset)),msg="if these tuples are different shows the differences")
     def test_run_insert(self):
         trans = Transaction()
         trans.add_query(self.query.insert, self.test_table, 3007, 9, 10, 11, 12)
@@ -152,7 +155,7 @@ class testingTransactions(unittest.TestCase):
         trans.add_query(self.query.update, self.test_table, 3006, None, 1, None, None, None)
         res = trans.run()
         self.assertTrue(res, msg="failed to commit and called abort returning false")
-        path, offset = self.test_table.page_directory['t1']
+        path, offset = self.test_table.page_directory[make_tail_rid(1)]
         self.assertEqual(self.test_table.bufferpool.get_page(path).read_index(offset).columns, [3006, 1, 6, 7, 8])
         
     def test_run_select_post_update(self):
@@ -163,7 +166,7 @@ class testingTransactions(unittest.TestCase):
         trans.add_query(self.query.select_version, self.test_table, 3006, 0, [1, 1, 1, 1, 1], -1)
         res = trans.run()
         self.assertTrue(res, msg="failed to commit and called abort returning false")
-        path, offset = self.test_table.page_directory['t3']
+        path, offset = self.test_table.page_directory[make_tail_rid(3)]
         self.assertEqual(self.test_table.bufferpool.get_page(path).read_index(offset).columns, [3006, 2, 6, 7, 8])
     
     def test_run_contending_insert(self):
@@ -179,8 +182,8 @@ class testingTransactions(unittest.TestCase):
         for worker in worker1, worker2:
             worker.run()
             
-        path1, offset1 = self.test_table.page_directory['b0']
-        path2, offset2 = self.test_table.page_directory['b1']
+        path1, offset1 = self.test_table.page_directory[make_base_rid(0)]
+        path2, offset2 = self.test_table.page_directory[make_base_rid(1)]
         
         if self.test_table.bufferpool.get_page(path1).read_index(offset1).columns == [1, 1, 1, 1, 1]:
             self.assertEqual(self.test_table.bufferpool.get_page(path1).read_index(offset1).columns, [1, 1, 1, 1, 1])
@@ -202,8 +205,8 @@ class testingTransactions(unittest.TestCase):
         for worker in worker1, worker2:
             worker.run()
             
-        path1, offset1 = self.test_table.page_directory['t1']
-        path2, offset2 = self.test_table.page_directory['t2']
+        path1, offset1 = self.test_table.page_directory[make_tail_rid(1)]
+        path2, offset2 = self.test_table.page_directory[make_tail_rid(2)]
         
         self.assertEqual(self.test_table.bufferpool.get_page(path1).read_index(offset1).columns, [1, 1, 1, 1, 1])
         self.assertEqual(self.test_table.bufferpool.get_page(path2).read_index(offset2).columns, [0, 0, 0, 0, 0])